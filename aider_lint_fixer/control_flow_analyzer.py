@@ -96,16 +96,25 @@ class ControlFlowAnalyzer:
     def __init__(self):
         self.current_analysis = None
         self.node_counter = 0
+        self._nodes_by_line = None  # First CFG node per line, built lazily per analysis
+        self._nodes_by_line_analysis = None
 
-    def analyze_file(self, file_path: str, error_lines: Set[int] = None) -> ControlFlowAnalysis:
-        """Analyze control flow for a file, focusing on areas with errors."""
+    def analyze_file(
+        self, file_path: str, error_lines: Set[int] = None, content: Optional[str] = None
+    ) -> ControlFlowAnalysis:
+        """Analyze control flow for a file, focusing on areas with errors.
+
+        Callers that already hold the file's text can pass it as ``content``
+        to avoid reading the file again.
+        """
 
         self.current_analysis = ControlFlowAnalysis(file_path=file_path)
         self.node_counter = 0
 
         try:
-            with open(file_path, "r", encoding="utf-8") as f:
-                content = f.read()
+            if content is None:
+                with open(file_path, "r", encoding="utf-8") as f:
+                    content = f.read()
 
             # Determine file type and analyze accordingly
             file_ext = Path(file_path).suffix.lower()
@@ -620,13 +629,18 @@ class ControlFlowAnalyzer:
                 insights["complexity_context"] = "medium"
 
         # Check reachability
-        error_nodes = [
-            node
-            for node in self.current_analysis.control_flow_graph.values()
-            if node.line_number == error_line
-        ]
-
-        if error_nodes and not error_nodes[0].is_reachable:
+        error_node = self._get_nodes_by_line().get(error_line)
+        if error_node is not None and not error_node.is_reachable:
             insights["reachable"] = False
 
         return insights
+
+    def _get_nodes_by_line(self) -> Dict[int, ControlFlowNode]:
+        """Index the current analysis' CFG by line, keeping the first node on each line."""
+        if self._nodes_by_line_analysis is not self.current_analysis:
+            nodes_by_line = {}
+            for node in self.current_analysis.control_flow_graph.values():
+                nodes_by_line.setdefault(node.line_number, node)
+            self._nodes_by_line = nodes_by_line
+            self._nodes_by_line_analysis = self.current_analysis
+        return self._nodes_by_line
@@ -13,11 +13,13 @@ Key Features:
 import logging
 from collections import defaultdict
 from dataclasses import dataclass
-from typing import Dict, List, Optional
+from functools import lru_cache
+from statistics import fmean
+from typing import Dict, List, Optional, Set, Tuple
 
 import networkx as nx
 import numpy as np
-from sklearn.cluster import KMeans
+from sklearn.cluster import KMeans, MiniBatchKMeans
 from sklearn.ensemble import RandomForestClassifier
 from sklearn.preprocessing import StandardScaler
 
@@ -26,6 +28,87 @@ from .error_analyzer import ErrorAnalysis
 
 logger = logging.getLogger(__name__)
 
+# Safe formatting rules that are auto-forced at a lower confidence
+SAFE_AUTO_FORCE_RULES = frozenset(
+    {"max-len", "semi", "no-trailing-spaces", "no-unused-vars", "quotes", "indent"}
+)
+# Formatting rules flagged by the ML "safe formatting" feature
+SAFE_FORMATTING_RULES = frozenset({"max-len", "no-unused-vars"})
+# Rules whose fixes are safe enough for a high base confidence
+SAFE_RULES = frozenset(
+    {
+        "max-len",
+        "no-unused-vars",
+        "no-useless-escape",
+        "prefer-const",
+        "semi",
+        "no-trailing-spaces",
+        "quotes",
+        "indent",
+    }
+)
+# Rules whose fixes may break runtime behavior
+DANGEROUS_RULES = frozenset({"no-unde", "no-global-assign", "no-implicit-globals"})
+# (undefined variable, safe formatting) error type feature columns by rule id;
+# any other rule is (0, 0)
+RULE_TYPE_FEATURES: Dict[str, Tuple[int, int]] = {
+    "no-unde": (1, 0),
+    **{rule_id: (0, 1) for rule_id in SAFE_FORMATTING_RULES},
+}
+NO_RULE_TYPE_FEATURES = (0, 0)
+# Files where long max-len lines may be template literals or concatenations
+JS_SUFFIXES = (".js", ".mjs", ".ts")
+
+# Base probability that a fix cascades into a dependent file
+CASCADE_BASE_RISK = 0.3
+# Error type risk multipliers
+CASCADE_ERROR_RISK = {
+    "no-unde": 0.8,  # Undefined variables have high cascade risk
+    "no-global-assign": 0.7,  # Global assignments affect many files
+    "import/no-unresolved": 0.9,  # Import errors cascade heavily
+    "unused-import": 0.2,  # Low cascade risk
+    "prefer-const": 0.1,  # Very low cascade risk
+}
+# Dependency type risk multipliers
+CASCADE_DEPENDENCY_RISK = {
+    "import": 0.8,  # Import dependencies have high risk
+    "calls": 0.6,  # Function calls have medium risk
+    "directory_proximity": 0.2,  # Directory proximity has low risk
+}
+CASCADE_DEFAULT_MULTIPLIER = 0.3
+# Boost applied when an edge carries imported names that might be affected
+CASCADE_IMPORTED_NAMES_BOOST = 1.2
+
+
+def _read_lines(file_path: str) -> Tuple[str, ...]:
+    """Read a file's lines as readlines() would."""
+    with open(file_path, "r", encoding="utf-8") as f:
+        return tuple(f)
+
+
+@lru_cache(maxsize=4096)
+def _path_features(file_path: str) -> Tuple[bool, bool, bool, bool, int]:
+    """Derive (is_test, is_js, is_py, is_config, depth) once per distinct file path."""
+    lower_path = file_path.lower()
+    return (
+        "test" in lower_path,
+        file_path.endswith(".js"),
+        file_path.endswith(".py"),
+        "config" in lower_path,
+        file_path.count("/") + 1,
+    )
+
+
+def _top_k_order(scores: np.ndarray, k: int) -> np.ndarray:
+    """Indices of the k highest scores, as a stable descending sort would give them."""
+    if scores.size > k:
+        # Partitioning finds the k-th highest score in linear time; only scores
+        # at or above it can be in the top k
+        kth_highest = -np.partition(-scores, k - 1)[k - 1]
+        candidates = np.flatnonzero(scores >= kth_highest)
+        return candidates[np.argsort(-scores[candidates], kind="stable")[:k]]
+    return np.argsort(-scores, kind="stable")
+
 
 @dataclass
 class ForceDecision:
@@ -51,9 +134,43 @@ class BatchPlan:
     dependencies: List[int] = None  # other batch IDs this depends on
 
 
+@dataclass
+class DecisionStats:
+    """Counts over force decisions gathered in a single pass for reporting."""
+
+    action_counts: Dict[str, int]
+    auto_force_count: int
+    dangerous_count: int  # undefined-variable errors
+    high_cascade_count: int  # decisions predicted to touch more than two files
+
+
+@dataclass
+class DependencyCSR:
+    """Read-only CSR snapshot of the dependency graph used for cascade traversal."""
+
+    graph: nx.DiGraph  # the graph this was built from, compared by identity
+    nodes: List[str]
+    node_to_idx: Dict[str, int]
+    graph_size: Tuple[int, int]  # (nodes, edges) of the graph when this was built
+    out_indptr: np.ndarray
+    out_indices: np.ndarray  # edges are numbered in out_indices order
+    in_indptr: np.ndarray
+    in_indices: np.ndarray
+    in_edges: np.ndarray  # number of the edge from each predecessor
+    edge_multiplier: np.ndarray  # 0 for edges without data, which never cascade
+    edge_boosted: np.ndarray
+    edge_is_import: np.ndarray
+
+
 class IntelligentForceMode:
     """ML-powered intelligent force mode for chaotic codebases."""
 
+    # Below this many batch-confirm decisions, batches are confidence quantiles
+    # rather than clusters; k-means is not worth fitting on so few points
+    QUANTILE_BATCHING_THRESHOLD = 50
+    # Number of recent fix outcomes the adaptive thresholds are based on
+    OUTCOME_WINDOW = 100
+
     def __init__(self, project_root: str):
         self.project_root = project_root
         # Confidence thresholds for different actions
@@ -71,63 +188,110 @@ class IntelligentForceMode:
         self.scaler = StandardScaler()
         # Learning system
         self.fix_history = []  # Track fix outcomes for learning
+        # Ring buffers mirroring the confidence and success of recent fix_history entries
+        self._outcome_confidences = np.zeros(self.OUTCOME_WINDOW)
+        self._outcome_successes = np.zeros(self.OUTCOME_WINDOW, dtype=bool)
+        self._outcomes_recorded = 0
         self.cascade_history = []  # Track cascade events
         # Code dependency graph for cascade prediction
+        self._dependency_csr: Optional[DependencyCSR] = None
         self.dependency_graph = nx.DiGraph()
         # Enhanced AST-based dependency analyzer
         self.ast_analyzer = EnhancedDependencyAnalyzer()
 
+    @property
+    def dependency_graph(self) -> nx.DiGraph:
+        """Code dependency graph used for cascade prediction."""
+        return self._dependency_graph
+
+    @dependency_graph.setter
+    def dependency_graph(self, graph: nx.DiGraph):
+        self._dependency_graph = graph
+        # The CSR snapshot describes the previous graph
+        self._dependency_csr = None
+
     def analyze_force_strategy(self, error_analyses: List[ErrorAnalysis]) -> Dict:
         """Analyze errors and create intelligent force strategy."""
         total_errors = len(error_analyses)
         is_chaotic = total_errors >= self.chaos_threshold
         logger.info(f"Analyzing force strategy for {total_errors} errors")
         logger.info(f"Chaotic codebase: {is_chaotic}")
+        rule_ids_by_file = self._index_files(error_analyses)
         # Step 1: Predict confidence for each error
-        force_decisions = self._predict_force_decisions(error_analyses)
+        force_decisions, batching_features = self._predict_force_decisions(error_analyses)
         # Step 2: Build code dependency graph
-        self._build_dependency_graph(error_analyses)
+        self._build_dependency_graph(error_analyses, rule_ids_by_file)
         # Step 3: Predict cascading effects
         self._predict_cascades(force_decisions)
         # Step 4: Optimize batching strategy
-        batch_plan = self._optimize_batching(force_decisions, is_chaotic)
+        batch_plan = self._optimize_batching(force_decisions, is_chaotic, batching_features)
         # Step 5: Create execution strategy
         strategy = self._create_execution_strategy(force_decisions, batch_plan, is_chaotic)
         return strategy
 
-    def _predict_force_decisions(self, error_analyses: List[ErrorAnalysis]) -> List[ForceDecision]:
-        """Predict confidence and action for each error."""
+    def _predict_force_decisions(
+        self, error_analyses: List[ErrorAnalysis]
+    ) -> Tuple[List[ForceDecision], np.ndarray]:
+        """Predict confidence and action for each error.
+
+        Returns:
+            The decisions, and their batching features as an array of shape
+            (len(error_analyses), 4): confidence, risk factor count, priority and
+            estimated effort
+        """
+        batching_features = np.empty((len(error_analyses), 4), dtype=np.float32)
+        if not error_analyses:
+            return [], batching_features
+        # Predict confidence (using existing SmartErrorClassifier as base). Files with
+        # many max-len errors are read once per prediction, not once per error
+        file_lines: Dict[str, Tuple[str, ...]] = {}
+        base_confidences = np.fromiter(
+            (self._get_base_confidence(ea, file_lines) for ea in error_analyses),
+            dtype=np.float64,
+            count=len(error_analyses),
+        )
+        # Enhanced action determination with research-based improvements
+        # Special cases: Safe formatting errors should be auto-forced more aggressively
+        is_safe_auto = np.fromiter(
+            (ea.error.rule_id in SAFE_AUTO_FORCE_RULES for ea in error_analyses),
+            dtype=bool,
+            count=len(error_analyses),
+        )
+        # Enhance with ML predictions. Safe auto-force rules need no feature extraction:
+        # their ML confidence is determined by the rule alone
+        ml_confidences = np.empty(len(error_analyses))
+        safe_rows = np.flatnonzero(is_safe_auto)
+        ml_confidences[safe_rows] = [
+            self._safe_rule_ml_confidence(error_analyses[row].error.rule_id) for row in safe_rows
+        ]
+        other_rows = np.flatnonzero(~is_safe_auto)
+        if other_rows.size:
+            # Extract features for ML prediction, one row per error
+            features = self._extract_feature_matrix([error_analyses[row] for row in other_rows])
+            ml_confidences[other_rows] = self._predict_ml_confidences(features)
+            # Priority and estimated effort are feature columns already
+            batching_features[other_rows, 2:] = features[:, [6, 8]]
+        batching_features[safe_rows, 2] = [error_analyses[row].priority for row in safe_rows]
+        batching_features[safe_rows, 3] = [
+            error_analyses[row].estimated_effort for row in safe_rows
+        ]
+        # Combine confidences
+        final_confidences = 0.7 * base_confidences + 0.3 * ml_confidences
+        # Standard action determination, first matching threshold wins
+        actions = np.select(
+            [
+                (is_safe_auto & (final_confidences >= 0.70))
+                | (final_confidences >= self.auto_force_threshold),
+                final_confidences >= self.batch_force_threshold,
+                final_confidences >= self.manual_review_threshold,
+            ],
+            ["auto_force", "batch_confirm", "manual_review"],
+            default="skip",
+        ).tolist()
         decisions = []
-        for error_analysis in error_analyses:
-            # Extract features for ML prediction
-            features = self._extract_error_features(error_analysis)
-            # Predict confidence (using existing SmartErrorClassifier as base)
-            base_confidence = self._get_base_confidence(error_analysis)
-            # Enhance with ML predictions
-            ml_confidence = self._predict_ml_confidence(features)
-            # Combine confidences
-            final_confidence = 0.7 * base_confidence + 0.3 * ml_confidence
-            # Enhanced action determination with research-based improvements
-            # Special cases: Safe formatting errors should be auto-forced more aggressively
-            safe_auto_force_rules = [
-                "max-len",
-                "semi",
-                "no-trailing-spaces",
-                "no-unused-vars",
-                "quotes",
-                "indent",
-            ]
-            if error_analysis.error.rule_id in safe_auto_force_rules and final_confidence >= 0.70:
-                action = "auto_force"
-            # Standard action determination
-            elif final_confidence >= self.auto_force_threshold:
-                action = "auto_force"
-            elif final_confidence >= self.batch_force_threshold:
-                action = "batch_confirm"
-            elif final_confidence >= self.manual_review_threshold:
-                action = "manual_review"
-            else:
-                action = "skip"
+        for error_analysis, action, final_confidence in zip(
+            error_analyses, actions, final_confidences.tolist()
+        ):
             # Identify risk factors
             risk_factors = self._identify_risk_factors(error_analysis, final_confidence)
             decision = ForceDecision(
@@ -137,17 +301,19 @@ class IntelligentForceMode:
                 risk_factors=risk_factors,
             )
             decisions.append(decision)
-        return decisions
+        batching_features[:, 0] = final_confidences
+        batching_features[:, 1] = [len(decision.risk_factors) for decision in decisions]
+        return decisions, batching_features
 
     def _extract_error_features(self, error_analysis: ErrorAnalysis) -> np.ndarray:
         """Extract ML features from error analysis."""
         features = []
         # Error type features
         error = error_analysis.error
+        # Dangerous undefined variable, safe formatting
+        features.extend(RULE_TYPE_FEATURES.get(error.rule_id, NO_RULE_TYPE_FEATURES))
         features.extend(
             [
-                1 if error.rule_id == "no-unde" else 0,  # Dangerous undefined variable
-                (1 if error.rule_id in ["max-len", "no-unused-vars"] else 0),  # Safe formatting
                 1 if error.severity.value == "error" else 0,  # Error vs warning
                 len(error.message),  # Message complexity
                 error.line,  # Line number (early vs late in file)
@@ -156,11 +322,7 @@ class IntelligentForceMode:
         # Context features
         features.extend(
             [
-                (
-                    error_analysis.complexity.value
-                    if hasattr(error_analysis.complexity, "value")
-                    else 1
-                ),
+                self._complexity_feature(error_analysis.complexity),
                 error_analysis.priority,
                 1 if error_analysis.fixable else 0,
                 error_analysis.estimated_effort,
@@ -181,34 +343,64 @@ class IntelligentForceMode:
         )
         return np.array(features)
 
-    def _get_base_confidence(self, error_analysis: ErrorAnalysis) -> float:
+    def _extract_feature_matrix(self, error_analyses: List[ErrorAnalysis]) -> np.ndarray:
+        """Extract the _extract_error_features columns for all errors at once.
+
+        Returns:
+            Array of shape (len(error_analyses), 16)
+        """
+        errors = [error_analysis.error for error_analysis in error_analyses]
+        features = np.empty((len(errors), 16), dtype=np.float32)
+        # Error type features
+        features[:, :2] = np.array(
+            [RULE_TYPE_FEATURES.get(error.rule_id, NO_RULE_TYPE_FEATURES) for error in errors],
+            dtype=np.float32,
+        ).reshape(len(errors), 2)
+        features[:, 2] = [error.severity.value == "error" for error in errors]
+        features[:, 3] = [len(error.message) for error in errors]
+        features[:, 4] = [error.line for error in errors]
+        # Context features
+        features[:, 5] = [self._complexity_feature(ea.complexity) for ea in error_analyses]
+        features[:, 6] = [ea.priority for ea in error_analyses]
+        features[:, 7] = [ea.fixable for ea in error_analyses]
+        features[:, 8] = [ea.estimated_effort for ea in error_analyses]
+        features[:, 9] = [len(ea.context_lines) for ea in error_analyses]
+        features[:, 10] = [len(ea.related_errors) for ea in error_analyses]
+        # File features: test, JavaScript, Python, config, directory depth
+        features[:, 11:] = np.array(
+            [_path_features(error.file_path) for error in errors], dtype=np.float32
+        ).reshape(len(errors), 5)
+        return features
+
+    @staticmethod
+    def _complexity_feature(complexity) -> float:
+        """Numeric complexity feature: numeric values as-is, enum members by rank."""
+        value = getattr(complexity, "value", 1)
+        if isinstance(value, (int, float)):
+            return value
+        # FixComplexity values are names; rank them TRIVIAL=1 .. MANUAL=5
+        return complexity.ordinal + 1
+
+    def _get_base_confidence(
+        self,
+        error_analysis: ErrorAnalysis,
+        file_lines: Optional[Dict[str, Tuple[str, ...]]] = None,
+    ) -> float:
         """Get base confidence from existing classification."""
         # Use existing fixable classification as base
         if not error_analysis.fixable:
             return 0.2  # Low confidence for unfixable errors
         # Safe error types get higher confidence, with enhanced JavaScript handling
-        safe_rules = [
-            "max-len",
-            "no-unused-vars",
-            "no-useless-escape",
-            "prefer-const",
-            "semi",
-            "no-trailing-spaces",
-            "quotes",
-            "indent",
-        ]
-        if error_analysis.error.rule_id in safe_rules:
+        error = error_analysis.error
+        if error.rule_id in SAFE_RULES:
             # Enhanced handling for max-len in JavaScript files
-            if error_analysis.error.rule_id == "max-len" and error_analysis.file_path.endswith(
-                (".js", ".mjs", ".ts")
-            ):
+            if error.rule_id == "max-len" and error.file_path.endswith(JS_SUFFIXES):
                 # Check if this is a complex template literal or string concatenation
-                if self._is_complex_javascript_string(error_analysis):
+                if self._is_complex_javascript_string(error_analysis, file_lines):
                     return 0.75  # Still high confidence - research shows these are fixable
             return 0.85
         # Dangerous error types get lower confidence
-        dangerous_rules = ["no-unde", "no-global-assign", "no-implicit-globals"]
-        if error_analysis.error.rule_id in dangerous_rules:
+        if error.rule_id in DANGEROUS_RULES:
             return 0.3
         # Medium confidence for other errors
         return 0.6
@@ -225,19 +417,40 @@ class IntelligentForceMode:
         else:
             return 0.6
 
-    def _is_complex_javascript_string(self, error_analysis: ErrorAnalysis) -> bool:
-        """Check if this is a complex JavaScript string that needs special handling."""
+    def _predict_ml_confidences(self, features: np.ndarray) -> np.ndarray:
+        """Vectorized _predict_ml_confidence over a feature matrix."""
+        return np.where(features[:, 1] == 1, 0.9, np.where(features[:, 0] == 1, 0.2, 0.6))
+
+    @staticmethod
+    def _safe_rule_ml_confidence(rule_id: str) -> float:
+        """_predict_ml_confidence for a safe auto-force rule, which is never "no-unde"."""
+        return 0.9 if rule_id in SAFE_FORMATTING_RULES else 0.6
+
+    def _is_complex_javascript_string(
+        self,
+        error_analysis: ErrorAnalysis,
+        file_lines: Optional[Dict[str, Tuple[str, ...]]] = None,
+    ) -> bool:
+        """Check if this is a complex JavaScript string that needs special handling.
+
+        file_lines holds the lines of files already read by path, so that the errors of
+        one prediction share a single read of each file.
+        """
+        error = error_analysis.error
+        if file_lines is None:
+            file_lines = {}
         try:
-            with open(error_analysis.file_path, "r", encoding="utf-8") as f:
-                lines = f.readlines()
-                if error_analysis.error.line <= len(lines):
-                    line = lines[error_analysis.error.line - 1]
-                    # Check for template literals, string concatenation, or complex patterns
-                    return (
-                        ("`" in line and "+" in line)
-                        or ("REPOSITORY CONTEXT" in line)
-                        or (line.count('"') > 4)
-                    )
+            lines = file_lines.get(error.file_path)
+            if lines is None:
+                lines = file_lines[error.file_path] = _read_lines(error.file_path)
+            if error.line <= len(lines):
+                line = lines[error.line - 1]
+                # Check for template literals, string concatenation, or complex patterns
+                return (
+                    ("`" in line and "+" in line)
+                    or ("REPOSITORY CONTEXT" in line)
+                    or (line.count('"') > 4)
+                )
         except Exception:
             pass
         return False
@@ -251,9 +464,10 @@ class IntelligentForceMode:
             risk_factors.append("Undefined variable may break runtime")
             risk_factors.append("Could be missing import or global")
         # File type risks
-        if "config" in error.file_path.lower():
+        is_test, _, _, is_config, _ = _path_features(error.file_path)
+        if is_config:
             risk_factors.append("Configuration file - changes affect entire system")
-        if "test" not in error.file_path.lower():
+        if not is_test:
             risk_factors.append("Production code - changes affect users")
         # Complexity risks
         if error_analysis.estimated_effort > 3:
@@ -263,35 +477,49 @@ class IntelligentForceMode:
             risk_factors.append("Multiple related errors - cascading effects possible")
         return risk_factors
 
-    def _build_dependency_graph(self, error_analyses: List[ErrorAnalysis]):
+    @staticmethod
+    def _index_files(error_analyses: List[ErrorAnalysis]) -> Dict[str, List[str]]:
+        """Group error rule ids by file path, files in first-seen order."""
+        rule_ids_by_file: Dict[str, List[str]] = {}
+        for error_analysis in error_analyses:
+            error = error_analysis.error
+            rule_ids = rule_ids_by_file.get(error.file_path)
+            if rule_ids is None:
+                rule_ids_by_file[error.file_path] = [error.rule_id]
+            else:
+                rule_ids.append(error.rule_id)
+        return rule_ids_by_file
+
+    def _build_dependency_graph(
+        self,
+        error_analyses: List[ErrorAnalysis],
+        rule_ids_by_file: Optional[Dict[str, List[str]]] = None,
+    ):
         """Build enhanced code dependency graph using AST analysis for cascade prediction."""
-        self.dependency_graph.clear()
         # Group errors by file
-        files_with_errors = defaultdict(list)
-        for error_analysis in error_analyses:
-            file_path = error_analysis.error.file_path
-            files_with_errors[file_path].append(error_analysis)
-        file_paths = list(files_with_errors.keys())
+        if rule_ids_by_file is None:
+            rule_ids_by_file = self._index_files(error_analyses)
+        file_paths = list(rule_ids_by_file)
         try:
             # Use AST analysis for enhanced dependency detection
             logger.info(f"Building AST-based dependency graph for {len(file_paths)} files")
-            enhanced_graph = self.ast_analyzer.analyze_files(file_paths)
-            # Merge the enhanced graph with our dependency graph
-            self.dependency_graph = enhanced_graph.copy()
+            # analyze_files clears and rebuilds the analyzer's graph in place, so hand it a
+            # fresh one; the graph it returns is then ours to annotate instead of copying
+            self.ast_analyzer.dependency_graph = nx.DiGraph()
+            self.dependency_graph = self.ast_analyzer.analyze_files(file_paths)
             # Add error-specific metadata to nodes
-            for file_path, error_list in files_with_errors.items():
+            for file_path, rule_ids in rule_ids_by_file.items():
                 if file_path in self.dependency_graph:
-                    self.dependency_graph.nodes[file_path]["error_count"] = len(error_list)
-                    self.dependency_graph.nodes[file_path]["error_types"] = [
-                        error.error.rule_id for error in error_list
-                    ]
+                    node = self.dependency_graph.nodes[file_path]
+                    node["error_count"] = len(rule_ids)
+                    node["error_types"] = list(rule_ids)
                 else:
                     # Add node if not found by AST analysis
                     self.dependency_graph.add_node(
                         file_path,
                         type="file",
-                        error_count=len(error_list),
-                        error_types=[error.error.rule_id for error in error_list],
+                        error_count=len(rule_ids),
+                        error_types=list(rule_ids),
                     )
             logger.info(
                 f"Enhanced dependency graph built with {self.dependency_graph.number_of_nodes()} nodes "
@@ -299,154 +527,237 @@ class IntelligentForceMode:
             )
         except Exception as e:
             logger.warning(f"AST analysis failed, falling back to simple heuristics: {e}")
-            # Fallback to simple heuristic-based approach
-            for file_path in files_with_errors:
+            # Fallback to simple heuristic-based approach on a graph of our own
+            self.dependency_graph = nx.DiGraph()
+            directories = {file_path: tuple(file_path.split("/")[:-1]) for file_path in file_paths}
+            files_by_directory = defaultdict(list)
+            for file_path, directory in directories.items():
+                files_by_directory[directory].append(file_path)
+            for file_path, rule_ids in rule_ids_by_file.items():
                 self.dependency_graph.add_node(
                     file_path,
                     type="file",
-                    error_count=len(files_with_errors[file_path]),
+                    error_count=len(rule_ids),
                 )
                 # Simple heuristic: files in same directory are related
-                for other_file in files_with_errors:
-                    if (
-                        file_path != other_file
-                        and file_path.split("/")[:-1] == other_file.split("/")[:-1]
-                    ):
+                for other_file in files_by_directory[directories[file_path]]:
+                    if file_path != other_file:
                         self.dependency_graph.add_edge(
                             file_path, other_file, type="directory_proximity"
                         )
+        self._dependency_csr = self._freeze_graph()
+
+    def _freeze_graph(self) -> DependencyCSR:
+        """Snapshot the dependency graph as CSR arrays for traversal without dict lookups."""
+        graph = self.dependency_graph
+        nodes = list(graph)
+        node_to_idx = {node: idx for idx, node in enumerate(nodes)}
+        edge_index: Dict[Tuple[str, str], int] = {}
+        edge_weights = []
+        edge_is_import = []
+        out_indptr = [0]
+        out_indices = []
+        for node in nodes:
+            for succ, edge_data in graph.succ[node].items():
+                edge_index[(node, succ)] = len(edge_weights)
+                edge_weights.append(self._edge_cascade_weight(edge_data))
+                edge_is_import.append(edge_data.get("type") == "import")
+                out_indices.append(node_to_idx[succ])
+            out_indptr.append(len(out_indices))
+
+        in_indptr = [0]
+        in_indices = []
+        in_edges = []
+        for node in nodes:
+            for pred in graph.pred[node]:
+                in_indices.append(node_to_idx[pred])
+                in_edges.append(edge_index[(pred, node)])
+            in_indptr.append(len(in_indices))
+
+        return DependencyCSR(
+            graph=graph,
+            nodes=nodes,
+            node_to_idx=node_to_idx,
+            graph_size=(len(nodes), len(edge_weights)),
+            out_indptr=np.asarray(out_indptr, dtype=np.intp),
+            out_indices=np.asarray(out_indices, dtype=np.intp),
+            in_indptr=np.asarray(in_indptr, dtype=np.intp),
+            in_indices=np.asarray(in_indices, dtype=np.intp),
+            in_edges=np.asarray(in_edges, dtype=np.intp),
+            edge_multiplier=np.asarray(
+                [weight[1] if weight else 0.0 for weight in edge_weights], dtype=np.float64
+            ),
+            edge_boosted=np.asarray(
+                [bool(weight and weight[2]) for weight in edge_weights], dtype=bool
+            ),
+            edge_is_import=np.asarray(edge_is_import, dtype=bool),
+        )
+
+    def _frozen_dependency_graph(self) -> DependencyCSR:
+        """Return the CSR snapshot, rebuilding it if the graph was replaced or resized."""
+        graph = self.dependency_graph
+        csr = self._dependency_csr
+        if (
+            csr is None
+            or csr.graph is not graph
+            or csr.graph_size != (graph.number_of_nodes(), graph.number_of_edges())
+        ):
+            csr = self._dependency_csr = self._freeze_graph()
+        return csr
 
     def _predict_cascades(self, force_decisions: List[ForceDecision]):
         """Predict cascading effects of fixes using enhanced dependency analysis."""
+        csr = self._frozen_dependency_graph()
+        # Graph cascades depend only on the file and rule, which many errors share
+        graph_cascades: Dict[Tuple[str, str], Tuple[Optional[List[str]], List[str]]] = {}
+        # AST dependencies per file, queried once however many errors the file has
+        ast_dependencies: Dict[str, Set[str]] = {}
         for decision in force_decisions:
             if decision.action in ["auto_force", "batch_confirm"]:
                 file_path = decision.error_analysis.error.file_path
                 error_type = decision.error_analysis.error.rule_id
-                predicted_cascades = []
-                if file_path in self.dependency_graph:
-                    # Get direct dependencies (files that depend on this file)
-                    direct_deps = list(self.dependency_graph.successors(file_path))
-                    # Get reverse dependencies (files this file depends on)
-                    reverse_deps = list(self.dependency_graph.predecessors(file_path))
-                    # Prioritize cascades based on error type and dependency strength
-                    for dep_file in direct_deps + reverse_deps:
-                        edge_data = self.dependency_graph.get_edge_data(
-                            file_path, dep_file
-                        ) or self.dependency_graph.get_edge_data(dep_file, file_path)
-                        if edge_data:
-                            # Calculate cascade risk based on dependency type and error type
-                            risk_score = self._calculate_cascade_risk(error_type, edge_data)
-                            if risk_score > 0.2:  # Only include significant risks
-                                predicted_cascades.append(
-                                    {
-                                        "file": dep_file,
-                                        "risk_score": risk_score,
-                                        "dependency_type": edge_data.get("type", "unknown"),
-                                    }
-                                )
-                    # Sort by risk score and take top 3
-                    predicted_cascades.sort(key=lambda x: x["risk_score"], reverse=True)
-                    decision.predicted_cascades = [c["file"] for c in predicted_cascades[:3]]
+                key = (file_path, error_type)
+                prediction = graph_cascades.get(key)
+                if prediction is None:
+                    prediction = self._predict_one_cascade(file_path, error_type, csr)
+                    graph_cascades[key] = prediction
+                predicted_cascades, risk_factors = prediction
+                if predicted_cascades is not None:
+                    decision.predicted_cascades = list(predicted_cascades)
                     # Add risk information to decision
-                    if predicted_cascades:
-                        max_risk = predicted_cascades[0]["risk_score"]
-                        if max_risk > 0.7:
-                            decision.risk_factors.append(
-                                f"High cascade risk ({max_risk:.1f}) to {len(predicted_cascades)} files"
-                            )
-                        elif max_risk > 0.5:
-                            decision.risk_factors.append(
-                                f"Medium cascade risk ({max_risk:.1f}) to {len(predicted_cascades)} files"
-                            )
+                    decision.risk_factors.extend(risk_factors)
                 # Enhanced cascade prediction for specific error types
                 if error_type in ["no-unde", "no-global-assign"]:
                     # Variable-related errors have higher cascade risk
-                    function_deps = self.ast_analyzer.get_function_dependencies(file_path)
-                    variable_deps = self.ast_analyzer.get_variable_dependencies(file_path)
-                    all_deps = set(function_deps + variable_deps)
+                    all_deps = ast_dependencies.get(file_path)
+                    if all_deps is None:
+                        function_deps = self.ast_analyzer.get_function_dependencies(file_path)
+                        variable_deps = self.ast_analyzer.get_variable_dependencies(file_path)
+                        all_deps = set(function_deps + variable_deps)
+                        ast_dependencies[file_path] = all_deps
                     for dep_file in all_deps:
                         if dep_file not in decision.predicted_cascades:
                             decision.predicted_cascades.append(dep_file)
                     # Limit total cascades
                     decision.predicted_cascades = decision.predicted_cascades[:5]
 
+    @staticmethod
+    def _predict_one_cascade(
+        file_path: str, error_type: str, csr: DependencyCSR
+    ) -> Tuple[Optional[List[str]], List[str]]:
+        """Return (top cascade files, risk factors) for an error, or (None, []) off-graph."""
+        node = csr.node_to_idx.get(file_path)
+        if node is None:
+            return None, []
+        out_start, out_end = csr.out_indptr[node], csr.out_indptr[node + 1]
+        in_start, in_end = csr.in_indptr[node], csr.in_indptr[node + 1]
+        # Files that depend on this file, then files this file depends on, each
+        # scored by the edge that links it to this file
+        deps = np.concatenate((csr.out_indices[out_start:out_end], csr.in_indices[in_start:in_end]))
+        edges = np.concatenate((np.arange(out_start, out_end), csr.in_edges[in_start:in_end]))
+        # Calculate cascade risk based on dependency type and error type
+        error_risk = CASCADE_BASE_RISK * CASCADE_ERROR_RISK.get(
+            error_type, CASCADE_DEFAULT_MULTIPLIER
+        )
+        risk_scores = error_risk * csr.edge_multiplier[edges]
+        risk_scores[csr.edge_boosted[edges]] *= CASCADE_IMPORTED_NAMES_BOOST
+        np.minimum(risk_scores, 1.0, out=risk_scores)
+        significant = risk_scores > 0.2  # Only include significant risks
+        deps, risk_scores = deps[significant], risk_scores[significant]
+        # Take the top 3 by risk score, ties in neighbour order
+        order = _top_k_order(risk_scores, 3)
+        predicted_cascades = [csr.nodes[dep] for dep in deps[order]]
+        risk_factors = []
+        if risk_scores.size:
+            max_risk = risk_scores[order[0]]
+            if max_risk > 0.7:
+                risk_factors.append(
+                    f"High cascade risk ({max_risk:.1f}) to {risk_scores.size} files"
+                )
+            elif max_risk > 0.5:
+                risk_factors.append(
+                    f"Medium cascade risk ({max_risk:.1f}) to {risk_scores.size} files"
+                )
+        return predicted_cascades, risk_factors
+
     def _calculate_cascade_risk(self, error_type: str, edge_data: dict) -> float:
         """Calculate cascade risk score based on error type and dependency relationship."""
-        base_risk = 0.3
-        # Error type risk multipliers
-        error_risk_multipliers = {
-            "no-unde": 0.8,  # Undefined variables have high cascade risk
-            "no-global-assign": 0.7,  # Global assignments affect many files
-            "import/no-unresolved": 0.9,  # Import errors cascade heavily
-            "unused-import": 0.2,  # Low cascade risk
-            "prefer-const": 0.1,  # Very low cascade risk
-        }
-        # Dependency type risk multipliers
-        dep_risk_multipliers = {
-            "import": 0.8,  # Import dependencies have high risk
-            "calls": 0.6,  # Function calls have medium risk
-            "directory_proximity": 0.2,  # Directory proximity has low risk
-        }
-        error_multiplier = error_risk_multipliers.get(error_type, 0.3)
-        dep_multiplier = dep_risk_multipliers.get(edge_data.get("type", "unknown"), 0.3)
-        # Calculate final risk score
-        risk_score = base_risk * error_multiplier * dep_multiplier
+        error_risk = CASCADE_BASE_RISK * CASCADE_ERROR_RISK.get(
+            error_type, CASCADE_DEFAULT_MULTIPLIER
+        )
+        _, dep_multiplier, boosted = self._edge_cascade_weight(edge_data)
+        return self._combine_cascade_risk(error_risk, dep_multiplier, boosted)
+
+    @staticmethod
+    def _edge_cascade_weight(edge_data: Optional[dict]) -> Optional[Tuple[str, float, bool]]:
+        """Return (dependency type, risk multiplier, imported-names boost) for an edge."""
+        if not edge_data:
+            return None
+        dep_type = edge_data.get("type", "unknown")
+        dep_multiplier = CASCADE_DEPENDENCY_RISK.get(dep_type, CASCADE_DEFAULT_MULTIPLIER)
+        return dep_type, dep_multiplier, bool(edge_data.get("imported_names"))
+
+    @staticmethod
+    def _combine_cascade_risk(error_risk: float, dep_multiplier: float, boosted: bool) -> float:
+        """Combine the error-type and dependency multipliers into a capped risk score."""
+        risk_score = error_risk * dep_multiplier
         # Boost risk if there are imported names that might be affected
-        if "imported_names" in edge_data and edge_data["imported_names"]:
-            risk_score *= 1.2
+        if boosted:
+            risk_score *= CASCADE_IMPORTED_NAMES_BOOST
         return min(risk_score, 1.0)  # Cap at 1.0
 
     def get_dependency_insights(self) -> Dict[str, any]:
         """Get insights about the dependency structure for recommendations."""
         if not self.dependency_graph.nodes():
             return {}
+        csr = self._frozen_dependency_graph()
         insights = {
-            "total_files": self.dependency_graph.number_of_nodes(),
-            "total_dependencies": self.dependency_graph.number_of_edges(),
+            "total_files": csr.graph_size[0],
+            "total_dependencies": csr.graph_size[1],
             "highly_connected_files": [],
             "isolated_files": [],
             "import_heavy_files": [],
             "dependency_clusters": [],
         }
+        in_degrees = np.diff(csr.in_indptr)
+        out_degrees = np.diff(csr.out_indptr)
+        total_degrees = in_degrees + out_degrees
         # Find highly connected files (potential architectural hotspots)
-        for node in self.dependency_graph.nodes():
-            in_degree = self.dependency_graph.in_degree(node)
-            out_degree = self.dependency_graph.out_degree(node)
-            total_degree = in_degree + out_degree
-            if total_degree > 5:  # Threshold for "highly connected"
-                insights["highly_connected_files"].append(
-                    {
-                        "file": node,
-                        "connections": total_degree,
-                        "dependents": in_degree,
-                        "dependencies": out_degree,
-                    }
-                )
-            elif total_degree == 0:
-                insights["isolated_files"].append(node)
+        for node in np.flatnonzero(total_degrees > 5):  # Threshold for "highly connected"
+            insights["highly_connected_files"].append(
+                {
+                    "file": csr.nodes[node],
+                    "connections": int(total_degrees[node]),
+                    "dependents": int(in_degrees[node]),
+                    "dependencies": int(out_degrees[node]),
+                }
+            )
+        insights["isolated_files"] = [
+            csr.nodes[node] for node in np.flatnonzero(total_degrees == 0)
+        ]
         # Find files with many imports (potential refactoring candidates)
-        for node in self.dependency_graph.nodes():
-            import_edges = [
-                edge
-                for edge in self.dependency_graph.out_edges(node, data=True)
-                if edge[2].get("type") == "import"
-            ]
-            if len(import_edges) > 10:  # Threshold for "import heavy"
-                insights["import_heavy_files"].append(
-                    {"file": node, "import_count": len(import_edges)}
-                )
+        edge_sources = np.repeat(np.arange(len(csr.nodes)), out_degrees)
+        import_counts = np.bincount(edge_sources[csr.edge_is_import], minlength=len(csr.nodes))
+        for node in np.flatnonzero(import_counts > 10):  # Threshold for "import heavy"
+            insights["import_heavy_files"].append(
+                {"file": csr.nodes[node], "import_count": int(import_counts[node])}
+            )
         # Sort by connection count
         insights["highly_connected_files"].sort(key=lambda x: x["connections"], reverse=True)
         insights["import_heavy_files"].sort(key=lambda x: x["import_count"], reverse=True)
         return insights
 
     def _optimize_batching(
-        self, force_decisions: List[ForceDecision], is_chaotic: bool
+        self,
+        force_decisions: List[ForceDecision],
+        is_chaotic: bool,
+        batching_features: Optional[np.ndarray] = None,
     ) -> List[BatchPlan]:
         """Optimize batching strategy using ML clustering."""
         # Separate decisions by action type
         auto_force_decisions = [d for d in force_decisions if d.action == "auto_force"]
-        batch_decisions = [d for d in force_decisions if d.action == "batch_confirm"]
+        batch_rows = [i for i, d in enumerate(force_decisions) if d.action == "batch_confirm"]
+        batch_decisions = [force_decisions[i] for i in batch_rows]
         batch_plans = []
         # Auto-force decisions don't need batching (they're automatic)
         if auto_force_decisions:
@@ -454,57 +765,73 @@ class IntelligentForceMode:
                 BatchPlan(
                     batch_id=0,
                     errors=[d.error_analysis for d in auto_force_decisions],
-                    confidence=np.mean([d.confidence for d in auto_force_decisions]),
+                    confidence=fmean(d.confidence for d in auto_force_decisions),
                     estimated_time=len(auto_force_decisions) * 2,  # 2 min per error
                     risk_level="low",
                 )
             )
         # Optimize batching for batch_confirm decisions
         if batch_decisions:
-            batches = self._create_optimal_batches(batch_decisions, is_chaotic)
+            batch_features = None if batching_features is None else batching_features[batch_rows]
+            batches = self._create_optimal_batches(batch_decisions, is_chaotic, batch_features)
             batch_plans.extend(batches)
         return batch_plans
 
     def _create_optimal_batches(
-        self, decisions: List[ForceDecision], is_chaotic: bool
+        self,
+        decisions: List[ForceDecision],
+        is_chaotic: bool,
+        features_array: Optional[np.ndarray] = None,
     ) -> List[BatchPlan]:
-        """Create optimal batches using clustering."""
+        """Create optimal batches using clustering.
+
+        features_array may hold the decisions' rows of the batching features returned
+        by _predict_force_decisions; it is updated in place.
+        """
         if not decisions:
             return []
-        # Extract features for clustering
-        features = []
-        for decision in decisions:
-            features.append(
-                [
-                    decision.confidence,
-                    len(decision.risk_factors) if decision.risk_factors else 0,
-                    decision.error_analysis.priority,
-                    decision.error_analysis.estimated_effort,
-                ]
-            )
-        features_array = np.array(features)
+        # Cascade prediction may have added risk factors since the features were built
+        risk_counts = [
+            len(decision.risk_factors) if decision.risk_factors else 0 for decision in decisions
+        ]
+        if features_array is None:
+            # Extract features for clustering; float32 is exact for these small counts
+            features_array = np.empty((len(decisions), 4), dtype=np.float32)
+            features_array[:, 0] = [decision.confidence for decision in decisions]
+            features_array[:, 2] = [decision.error_analysis.priority for decision in decisions]
+            features_array[:, 3] = [
+                decision.error_analysis.estimated_effort for decision in decisions
+            ]
+        features_array[:, 1] = risk_counts
         # Determine number of batches
         if is_chaotic:
             n_batches = min(len(decisions) // self.optimal_batch_size + 1, 8)
         else:
             n_batches = min(len(decisions) // 10 + 1, 4)
         # Cluster decisions into batches
-        if len(decisions) > n_batches:
-            kmeans = KMeans(n_clusters=n_batches, random_state=42)
-            cluster_labels = kmeans.fit_predict(features_array)
-        else:
+        if len(decisions) <= n_batches:
             cluster_labels = list(range(len(decisions)))
+        elif len(decisions) < self.QUANTILE_BATCHING_THRESHOLD:
+            cluster_labels = self._quantile_labels(features_array[:, 0], n_batches)
+        else:
+            kmeans = MiniBatchKMeans(
+                n_clusters=n_batches,
+                n_init=1,
+                max_iter=20,
+                batch_size=min(256, len(decisions)),
+                random_state=42,
+            )
+            cluster_labels = kmeans.fit_predict(self.scaler.fit_transform(features_array))
         # Create batch plans
+        batch_members = [[] for _ in range(n_batches)]
+        for position, label in enumerate(cluster_labels):
+            batch_members[label].append(position)
         batches = []
-        for batch_id in range(n_batches):
-            batch_decisions = [
-                decisions[i] for i, label in enumerate(cluster_labels) if label == batch_id
-            ]
-            if batch_decisions:
-                avg_confidence = np.mean([d.confidence for d in batch_decisions])
-                total_risk_factors = sum(
-                    len(d.risk_factors) if d.risk_factors else 0 for d in batch_decisions
-                )
+        for batch_id, positions in enumerate(batch_members):
+            if positions:
+                batch_decisions = [decisions[i] for i in positions]
+                avg_confidence = fmean(d.confidence for d in batch_decisions)
+                total_risk_factors = sum(risk_counts[i] for i in positions)
                 # Determine risk level
                 if avg_confidence > 0.8 and total_risk_factors < 5:
                     risk_level = "low"
@@ -522,6 +849,12 @@ class IntelligentForceMode:
                 batches.append(batch)
         return batches
 
+    @staticmethod
+    def _quantile_labels(confidences: np.ndarray, n_batches: int) -> np.ndarray:
+        """Label each decision with its confidence quantile, 0 being the least confident."""
+        edges = np.quantile(confidences, np.linspace(0, 1, n_batches + 1)[1:-1])
+        return np.digitize(confidences, edges)
+
     def _create_execution_strategy(
         self,
         force_decisions: List[ForceDecision],
@@ -529,11 +862,9 @@ class IntelligentForceMode:
         is_chaotic: bool,
     ) -> Dict:
         """Create final execution strategy."""
-        # Count decisions by action
-        action_counts = defaultdict(int)
-        for decision in force_decisions:
-            action_counts[decision.action] += 1
+        stats = self._collect_stats(force_decisions)
         # Calculate time estimates
+        action_counts = stats.action_counts
         total_auto_force = action_counts["auto_force"]
         total_batch_confirm = action_counts["batch_confirm"]
         total_manual_review = action_counts["manual_review"]
@@ -549,20 +880,42 @@ class IntelligentForceMode:
             "batch_plans": batch_plans,
             "estimated_time_minutes": estimated_time,
             "auto_force_enabled": total_auto_force > 0,
-            "recommendations": self._generate_recommendations(force_decisions, is_chaotic),
+            "recommendations": self._generate_recommendations(force_decisions, is_chaotic, stats),
             "force_decisions": force_decisions,
         }
         return strategy
 
+    @staticmethod
+    def _collect_stats(force_decisions: List[ForceDecision]) -> DecisionStats:
+        """Count actions, dangerous errors and wide cascades in one pass."""
+        action_counts = defaultdict(int)
+        dangerous_count = 0
+        high_cascade_count = 0
+        for decision in force_decisions:
+            action_counts[decision.action] += 1
+            if decision.error_analysis.error.rule_id == "no-unde":
+                dangerous_count += 1
+            if decision.predicted_cascades and len(decision.predicted_cascades) > 2:
+                high_cascade_count += 1
+        return DecisionStats(
+            action_counts=action_counts,
+            auto_force_count=action_counts["auto_force"],
+            dangerous_count=dangerous_count,
+            high_cascade_count=high_cascade_count,
+        )
+
     def _generate_recommendations(
-        self, force_decisions: List[ForceDecision], is_chaotic: bool
+        self,
+        force_decisions: List[ForceDecision],
+        is_chaotic: bool,
+        stats: Optional[DecisionStats] = None,
     ) -> List[str]:
         """Generate intelligent recommendations for the user."""
         recommendations = []
-        auto_force_count = sum(1 for d in force_decisions if d.action == "auto_force")
-        dangerous_count = sum(
-            1 for d in force_decisions if d.error_analysis.error.rule_id == "no-unde"
-        )
+        if stats is None:
+            stats = self._collect_stats(force_decisions)
+        auto_force_count = stats.auto_force_count
+        dangerous_count = stats.dangerous_count
         # Get dependency insights for enhanced recommendations
         dep_insights = self.get_dependency_insights()
         if is_chaotic:
@@ -601,12 +954,9 @@ class IntelligentForceMode:
                     "potential refactoring candidates"
                 )
         # Add cascade-specific recommendations
-        high_cascade_decisions = [
-            d for d in force_decisions if d.predicted_cascades and len(d.predicted_cascades) > 2
-        ]
-        if high_cascade_decisions:
+        if stats.high_cascade_count:
             recommendations.append(
-                f"🌊 {len(high_cascade_decisions)} fixes may cause cascading changes - "
+                f"🌊 {stats.high_cascade_count} fixes may cause cascading changes - "
                 "review carefully"
             )
         return recommendations
@@ -623,6 +973,10 @@ class IntelligentForceMode:
             or (not success and decision.confidence < 0.7),
         }
         self.fix_history.append(outcome)
+        slot = self._outcomes_recorded % self.OUTCOME_WINDOW
+        self._outcome_confidences[slot] = decision.confidence
+        self._outcome_successes[slot] = success
+        self._outcomes_recorded += 1
         # Update confidence thresholds based on learning
         if len(self.fix_history) > 100:
             self._update_confidence_thresholds()
@@ -630,12 +984,14 @@ class IntelligentForceMode:
     def _update_confidence_thresholds(self):
         """Update confidence thresholds based on learning history."""
         # Analyze recent outcomes to adjust thresholds
-        recent_outcomes = self.fix_history[-100:]
+        if self._outcomes_recorded != len(self.fix_history):
+            self._sync_outcome_window()
+        recent_count = min(self._outcomes_recorded, self.OUTCOME_WINDOW)
         # Calculate success rates by confidence range
-        high_conf_success = sum(
-            1 for o in recent_outcomes if o["decision"].confidence > 0.8 and o["success"]
-        )
-        high_conf_total = sum(1 for o in recent_outcomes if o["decision"].confidence > 0.8)
+        high_conf = self._outcome_confidences[:recent_count] > 0.8
+        recent_successes = self._outcome_successes[:recent_count]
+        high_conf_success = int(np.count_nonzero(high_conf & recent_successes))
+        high_conf_total = int(np.count_nonzero(high_conf))
         if high_conf_total > 10:
             success_rate = high_conf_success / high_conf_total
             # Adjust auto-force threshold based on success rate
@@ -644,3 +1000,12 @@ class IntelligentForceMode:
             elif success_rate < 0.85:
                 self.auto_force_threshold = min(0.95, self.auto_force_threshold + 0.02)
         logger.info(f"Updated auto-force threshold to {self.auto_force_threshold:.2f}")
+
+    def _sync_outcome_window(self):
+        """Rebuild the outcome ring buffers after fix_history was changed directly."""
+        recent_outcomes = self.fix_history[-self.OUTCOME_WINDOW :]
+        total = len(self.fix_history)
+        slots = np.arange(total - len(recent_outcomes), total) % self.OUTCOME_WINDOW
+        self._outcome_confidences[slots] = [o["decision"].confidence for o in recent_outcomes]
+        self._outcome_successes[slots] = [bool(o["success"]) for o in recent_outcomes]
+        self._outcomes_recorded = total
@@ -11,7 +11,9 @@ This module implements an intelligent iterative system that:
 import logging
 from dataclasses import dataclass
 from enum import Enum
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
 
 from .context_manager import ContextManager, ContextPriority
 from .convergence_analyzer import AdvancedConvergenceAnalyzer, ConvergenceState
@@ -19,6 +21,16 @@ from .cost_monitor import BudgetExceededException, CostMonitor
 
 logger = logging.getLogger(__name__)
 
+# IterationResult fields kept column-wise for trend and convergence statistics
+ITERATION_METRIC_DTYPES = {
+    "improvement_percentage": np.float64,
+    "success_rate": np.float64,
+    "ml_accuracy": np.float64,
+    "cost": np.float64,
+    "errors_after": np.int64,
+    "tokens_used": np.int64,
+}
+
 
 class LoopExitReason(Enum):
     """Reasons why the iterative loop exited."""
@@ -35,7 +47,7 @@ class LoopExitReason(Enum):
     BUDGET_PREDICTED_EXCEEDED = "budget_predicted_exceeded"
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class IterationResult:
     """Results from a single iteration."""
 
@@ -54,16 +66,75 @@ class IterationResult:
     tokens_used: int = 0  # Total tokens used in this iteration
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class LoopRecommendation:
     """Recommendations for next steps after loop completion."""
 
     action: str  # 'continue', 'manual_review', 'refactor', 'architect_mode'
     reason: str
-    specific_suggestions: List[str]
+    specific_suggestions: Sequence[str]
     estimated_effort: str  # 'low', 'medium', 'high', 'very_high'
-    priority_files: List[str]
-    dangerous_patterns: List[str]
+    priority_files: Sequence[str]
+    dangerous_patterns: Sequence[str]
+
+
+# Recommendations that do not depend on the loop results, built once per process. They are
+# shared by every caller, so their string collections are immutable tuples
+STATIC_RECOMMENDATIONS: Dict[LoopExitReason, LoopRecommendation] = {
+    LoopExitReason.REFACTOR_RECOMMENDED: LoopRecommendation(
+        action="refactor",
+        reason="High error density and complexity suggest architectural issues",
+        specific_suggestions=(
+            "Consider breaking large files into smaller modules",
+            "Implement proper TypeScript for better type safety",
+            "Establish consistent coding standards",
+            "Add comprehensive linting configuration",
+            "Consider migrating to modern framework patterns",
+        ),
+        estimated_effort="very_high",
+        priority_files=(),
+        dangerous_patterns=("no-unde", "max-len", "no-unused-vars"),
+    ),
+    LoopExitReason.DIMINISHING_RETURNS: LoopRecommendation(
+        action="architect_mode",
+        reason="Remaining errors require expert analysis",
+        specific_suggestions=(
+            "Use architect mode for complex undefined variables",
+            "Generate Chain of Thought prompts for external AI review",
+            "Focus on structural issues rather than style",
+            "Consider pair programming for difficult errors",
+        ),
+        estimated_effort="high",
+        priority_files=(),
+        dangerous_patterns=("no-unde", "no-global-assign"),
+    ),
+    LoopExitReason.CONVERGENCE_DETECTED: LoopRecommendation(
+        action="manual_review",
+        reason="Automated fixes have reached their limit",
+        specific_suggestions=(
+            "Remaining errors likely require human judgment",
+            "Review architectural decisions for remaining issues",
+            "Consider if remaining errors are acceptable technical debt",
+            "Document decisions for future reference",
+        ),
+        estimated_effort="medium",
+        priority_files=(),
+        dangerous_patterns=(),
+    ),
+    LoopExitReason.ERROR_INCREASE: LoopRecommendation(
+        action="manual_review",
+        reason="Automated fixes are introducing new errors",
+        specific_suggestions=(
+            "Review recent changes for unintended side effects",
+            "Consider rolling back last iteration",
+            "Use more conservative fix strategies",
+            "Increase test coverage before continuing",
+        ),
+        estimated_effort="high",
+        priority_files=(),
+        dangerous_patterns=(),
+    ),
+}
 
 
 class IterativeForceMode:
@@ -90,6 +161,14 @@ class IterativeForceMode:
         self.convergence_analyzer = AdvancedConvergenceAnalyzer(project_root)
         # Tracking
         self.iteration_results: List[IterationResult] = []
+        self._metric_columns = {
+            field: np.empty(self.max_iterations, dtype=dtype)
+            for field, dtype in ITERATION_METRIC_DTYPES.items()
+        }
+        self._metric_count = 0
+        self._metric_source = self.iteration_results
+        # Analyses of the append-only results, keyed by how many results they cover
+        self._analysis_cache: Dict[int, Dict] = {}
         self.total_time = 0.0
         self.total_errors_fixed = 0
         # Refactor detection thresholds
@@ -128,46 +207,47 @@ class IterativeForceMode:
                 LoopExitReason.MAX_ITERATIONS_REACHED,
                 f"Reached maximum iterations ({self.max_iterations})",
             )
-        if len(self.iteration_results) < 2:
+        result_count = len(self.iteration_results)
+        if result_count < 2:
             return True, None, "Need at least 2 iterations for analysis"
         latest = self.iteration_results[-1]
-        previous = self.iteration_results[-2]
+        latest_improvement = latest.improvement_percentage
+        error_increase = latest.errors_after - self.iteration_results[-2].errors_after
         # Check for error increase
-        if latest.errors_after > previous.errors_after + self.max_error_increase_tolerance:
+        if error_increase > self.max_error_increase_tolerance:
             return (
                 False,
                 LoopExitReason.ERROR_INCREASE,
-                f"Errors increased by {latest.errors_after - previous.errors_after}",
+                f"Errors increased by {error_increase}",
             )
         # Check for no improvement
-        if latest.improvement_percentage <= 0:
+        if latest_improvement <= 0:
             return (
                 False,
                 LoopExitReason.NO_IMPROVEMENT,
                 "No improvement in latest iteration",
             )
         # Check improvement threshold
-        if latest.improvement_percentage < self.improvement_threshold:
+        if latest_improvement < self.improvement_threshold:
             return (
                 False,
                 LoopExitReason.IMPROVEMENT_THRESHOLD_NOT_MET,
-                f"Improvement {latest.improvement_percentage:.1f}% below threshold {self.improvement_threshold}%",
+                f"Improvement {latest_improvement:.1f}% below threshold {self.improvement_threshold}%",
             )
-        # Check for diminishing returns
-        if len(self.iteration_results) >= 3:
-            recent_improvements = [r.improvement_percentage for r in self.iteration_results[-3:]]
-            avg_improvement = sum(recent_improvements) / len(recent_improvements)
+        if result_count >= 3:
+            # Check for diminishing returns
+            avg_improvement = self._iteration_metrics()["improvement_percentage"][-3:].mean()
             if avg_improvement < self.diminishing_returns_threshold:
                 return (
                     False,
                     LoopExitReason.DIMINISHING_RETURNS,
                     f"Average improvement {avg_improvement:.1f}% indicates diminishing returns",
                 )
-        # Advanced convergence detection using ML analysis
-        if len(self.iteration_results) >= 3:
+            # Advanced convergence detection using ML analysis
             convergence_analysis = self.convergence_analyzer.analyze_convergence()
+            convergence_state = convergence_analysis.current_state
             # Check for ML-detected convergence
-            if convergence_analysis.current_state == ConvergenceState.CONVERGED:
+            if convergence_state == ConvergenceState.CONVERGED:
                 return (
                     False,
                     LoopExitReason.CONVERGENCE_DETECTED,
@@ -175,7 +255,7 @@ class IterativeForceMode:
                 )
             # Check for plateau with low improvement potential
             if (
-                convergence_analysis.current_state == ConvergenceState.PLATEAUING
+                convergence_state == ConvergenceState.PLATEAUING
                 and convergence_analysis.improvement_potential < 0.2
             ):
                 return (
@@ -184,7 +264,7 @@ class IterativeForceMode:
                     f"Plateau detected with low improvement potential ({convergence_analysis.improvement_potential:.2f})",
                 )
             # Check for diverging performance
-            if convergence_analysis.current_state == ConvergenceState.DIVERGING:
+            if convergence_state == ConvergenceState.DIVERGING:
                 return (
                     False,
                     LoopExitReason.ERROR_INCREASE,
@@ -193,7 +273,7 @@ class IterativeForceMode:
             # Add convergence insights to context
             convergence_context = (
                 "Convergence Analysis:\n"
-                f"- State: {convergence_analysis.current_state.value}\n"
+                f"- State: {convergence_state.value}\n"
                 f"- Confidence: {convergence_analysis.confidence:.2f}\n"
                 f"- Improvement potential: {convergence_analysis.improvement_potential:.2f}\n"
                 f"- Predicted remaining: {convergence_analysis.predicted_iterations_remaining} iterations\n"
@@ -206,11 +286,9 @@ class IterativeForceMode:
                 iteration=current_iteration,
             )
         # Fallback to simple convergence check
-        if len(self.iteration_results) >= self.convergence_window:
-            recent_errors = [
-                r.errors_after for r in self.iteration_results[-self.convergence_window :]
-            ]
-            error_variance = max(recent_errors) - min(recent_errors)
+        if result_count >= self.convergence_window:
+            recent_errors = self._iteration_metrics()["errors_after"][-self.convergence_window :]
+            error_variance = int(np.ptp(recent_errors))
             if error_variance <= 2:  # Very small variance indicates convergence
                 return (
                     False,
@@ -288,6 +366,7 @@ class IterativeForceMode:
             tokens_used=tokens_used,
         )
         self.iteration_results.append(result)
+        self._iteration_metrics()  # Copy the new result into the metric columns
         self.total_time += time_taken
         self.total_errors_fixed += errors_fixed
         # Add iteration results to context
@@ -337,19 +416,23 @@ class IterativeForceMode:
         """Analyze patterns across iterations for insights."""
         if len(self.iteration_results) < 2:
             return {}
+        metrics = self._iteration_metrics()
+        cached = self._analysis_cache.get(len(self.iteration_results))
+        if cached is not None:
+            # Callers get their own copy so changes to it don't leak into the cache
+            return dict(cached)
         # Calculate trends
-        improvements = [r.improvement_percentage for r in self.iteration_results]
-        success_rates = [r.success_rate for r in self.iteration_results]
-        ml_accuracies = [r.ml_accuracy for r in self.iteration_results]
-        costs = [r.cost for r in self.iteration_results]
-        tokens = [r.tokens_used for r in self.iteration_results]
-        total_cost = sum(costs)
-        total_tokens = sum(tokens)
+        improvements = metrics["improvement_percentage"]
+        success_rates = metrics["success_rate"]
+        ml_accuracies = metrics["ml_accuracy"]
+        costs = metrics["cost"]
+        total_cost = float(costs.sum())
+        total_tokens = int(metrics["tokens_used"].sum())
         analysis = {
             "total_iterations": len(self.iteration_results),
             "total_errors_eliminated": self.iteration_results[0].errors_before
             - self.iteration_results[-1].errors_after,
-            "average_improvement_per_iteration": sum(improvements) / len(improvements),
+            "average_improvement_per_iteration": float(improvements.mean()),
             "improvement_trend": (
                 "increasing" if improvements[-1] > improvements[0] else "decreasing"
             ),
@@ -374,7 +457,36 @@ class IterativeForceMode:
                 "improving" if len(costs) > 1 and costs[-1] < costs[0] else "stable"
             ),
         }
-        return analysis
+        self._analysis_cache[len(self.iteration_results)] = analysis
+        return dict(analysis)
+
+    def _iteration_metrics(self) -> Dict[str, np.ndarray]:
+        """Return per-iteration metric columns covering iteration_results.
+
+        New results are copied into the columns once; a results list that was replaced or
+        shortened is re-read from the start, dropping the analyses cached for the old list.
+        """
+        results = self.iteration_results
+        if self._metric_source is not results or self._metric_count > len(results):
+            self._metric_source = results
+            self._metric_count = 0
+            self._analysis_cache.clear()
+        if self._metric_count < len(results):
+            capacity = len(self._metric_columns["errors_after"])
+            if len(results) > capacity:
+                # max_iterations may be raised after construction
+                capacity = max(len(results), 2 * capacity)
+                for field, column in self._metric_columns.items():
+                    grown = np.empty(capacity, dtype=column.dtype)
+                    grown[: self._metric_count] = column[: self._metric_count]
+                    self._metric_columns[field] = grown
+            for index in range(self._metric_count, len(results)):
+                result = results[index]
+                for field, column in self._metric_columns.items():
+                    column[index] = getattr(result, field)
+            self._metric_count = len(results)
+        count = self._metric_count
+        return {field: column[:count] for field, column in self._metric_columns.items()}
 
     def get_optimized_context_for_ai(self) -> str:
         """Get optimized context for AI consumption in next iteration."""
@@ -445,6 +557,9 @@ class IterativeForceMode:
         self, exit_reason: LoopExitReason, exit_message: str
     ) -> LoopRecommendation:
         """Generate intelligent recommendations based on loop results."""
+        static_recommendation = STATIC_RECOMMENDATIONS.get(exit_reason)
+        if static_recommendation is not None:
+            return static_recommendation
         analysis = self.analyze_iteration_patterns()
         latest = self.iteration_results[-1] if self.iteration_results else None
         if exit_reason == LoopExitReason.MAX_ITERATIONS_REACHED:
@@ -504,63 +619,6 @@ class IterativeForceMode:
                 priority_files=[],
                 dangerous_patterns=[],
             )
-        elif exit_reason == LoopExitReason.REFACTOR_RECOMMENDED:
-            return LoopRecommendation(
-                action="refactor",
-                reason="High error density and complexity suggest architectural issues",
-                specific_suggestions=[
-                    "Consider breaking large files into smaller modules",
-                    "Implement proper TypeScript for better type safety",
-                    "Establish consistent coding standards",
-                    "Add comprehensive linting configuration",
-                    "Consider migrating to modern framework patterns",
-                ],
-                estimated_effort="very_high",
-                priority_files=[],
-                dangerous_patterns=["no-unde", "max-len", "no-unused-vars"],
-            )
-        elif exit_reason == LoopExitReason.DIMINISHING_RETURNS:
-            return LoopRecommendation(
-                action="architect_mode",
-                reason="Remaining errors require expert analysis",
-                specific_suggestions=[
-                    "Use architect mode for complex undefined variables",
-                    "Generate Chain of Thought prompts for external AI review",
-                    "Focus on structural issues rather than style",
-                    "Consider pair programming for difficult errors",
-                ],
-                estimated_effort="high",
-                priority_files=[],
-                dangerous_patterns=["no-unde", "no-global-assign"],
-            )
-        elif exit_reason == LoopExitReason.CONVERGENCE_DETECTED:
-            return LoopRecommendation(
-                action="manual_review",
-                reason="Automated fixes have reached their limit",
-                specific_suggestions=[
-                    "Remaining errors likely require human judgment",
-                    "Review architectural decisions for remaining issues",
-                    "Consider if remaining errors are acceptable technical debt",
-                    "Document decisions for future reference",
-                ],
-                estimated_effort="medium",
-                priority_files=[],
-                dangerous_patterns=[],
-            )
-        elif exit_reason == LoopExitReason.ERROR_INCREASE:
-            return LoopRecommendation(
-                action="manual_review",
-                reason="Automated fixes are introducing new errors",
-                specific_suggestions=[
-                    "Review recent changes for unintended side effects",
-                    "Consider rolling back last iteration",
-                    "Use more conservative fix strategies",
-                    "Increase test coverage before continuing",
-                ],
-                estimated_effort="high",
-                priority_files=[],
-                dangerous_patterns=[],
-            )
         else:
             return LoopRecommendation(
                 action="manual_review",
@@ -577,50 +635,56 @@ class IterativeForceMode:
 
     def display_loop_summary(self, exit_reason: LoopExitReason, exit_message: str):
         """Display comprehensive summary of iterative loop results."""
-        print("\n🔄 ITERATIVE FORCE MODE SUMMARY")
-        print("=" * 60)
+        # Collect the summary and print it in one call rather than line by line
+        lines = ["\n🔄 ITERATIVE FORCE MODE SUMMARY", "=" * 60]
         if not self.iteration_results:
-            print("No iterations completed.")
+            lines.append("No iterations completed.")
+            print("\n".join(lines))
             return
         analysis = self.analyze_iteration_patterns()
         first = self.iteration_results[0]
         last = self.iteration_results[-1]
         # Overall results
-        print("📊 Overall Results:")
-        print(f"   Iterations completed: {analysis['total_iterations']}")
-        print(f"   Total errors eliminated: {analysis['total_errors_eliminated']}")
-        print(f"   Error reduction: {first.errors_before} → {last.errors_after}")
-        print(
-            f"   Overall improvement: {((first.errors_before - last.errors_after) / first.errors_before * 100):.1f}%"
-        )
-        print(f"   Total time: {analysis['total_time']:.1f} minutes")
-        print(f"   Efficiency: {analysis['efficiency']:.1f} errors/minute")
+        lines += [
+            "📊 Overall Results:",
+            f"   Iterations completed: {analysis['total_iterations']}",
+            f"   Total errors eliminated: {analysis['total_errors_eliminated']}",
+            f"   Error reduction: {first.errors_before} → {last.errors_after}",
+            f"   Overall improvement: {((first.errors_before - last.errors_after) / first.errors_before * 100):.1f}%",
+            f"   Total time: {analysis['total_time']:.1f} minutes",
+            f"   Efficiency: {analysis['efficiency']:.1f} errors/minute",
+        ]
         # Iteration breakdown
-        print("\n📈 Iteration Breakdown:")
-        for result in self.iteration_results:
-            print(
-                f"   Iteration {result.iteration}: {result.errors_before} → {result.errors_after} "
-                f"({result.improvement_percentage:+.1f}%, {result.success_rate:.1f}% success)"
-            )
+        lines.append("\n📈 Iteration Breakdown:")
+        lines.extend(
+            f"   Iteration {result.iteration}: {result.errors_before} → {result.errors_after} "
+            f"({result.improvement_percentage:+.1f}%, {result.success_rate:.1f}% success)"
+            for result in self.iteration_results
+        )
         # Exit reason
-        print("\n🛑 Loop Exit Reason:")
-        print(f"   {exit_reason.value}: {exit_message}")
+        lines += ["\n🛑 Loop Exit Reason:", f"   {exit_reason.value}: {exit_message}"]
         # Trends
-        print("\n📊 Trends:")
-        print(f"   Improvement trend: {analysis['improvement_trend']}")
-        print(f"   Success rate trend: {analysis['success_rate_trend']}")
-        print(f"   ML learning trend: {analysis['ml_learning_trend']}")
+        lines += [
+            "\n📊 Trends:",
+            f"   Improvement trend: {analysis['improvement_trend']}",
+            f"   Success rate trend: {analysis['success_rate_trend']}",
+            f"   ML learning trend: {analysis['ml_learning_trend']}",
+        ]
         # Generate and display recommendations
         recommendations = self.generate_recommendations(exit_reason, exit_message)
-        print("\n💡 RECOMMENDATIONS:")
-        print(f"   Recommended action: {recommendations.action.upper()}")
-        print(f"   Reason: {recommendations.reason}")
-        print(f"   Estimated effort: {recommendations.estimated_effort}")
-        print("\n🎯 Specific Suggestions:")
-        for i, suggestion in enumerate(recommendations.specific_suggestions, 1):
-            print(f"   {i}. {suggestion}")
+        lines += [
+            "\n💡 RECOMMENDATIONS:",
+            f"   Recommended action: {recommendations.action.upper()}",
+            f"   Reason: {recommendations.reason}",
+            f"   Estimated effort: {recommendations.estimated_effort}",
+            "\n🎯 Specific Suggestions:",
+        ]
+        lines.extend(
+            f"   {i}. {suggestion}"
+            for i, suggestion in enumerate(recommendations.specific_suggestions, 1)
+        )
         if recommendations.dangerous_patterns:
-            print("\n⚠️  Focus on these error patterns:")
-            for pattern in recommendations.dangerous_patterns:
-                print(f"   • {pattern}")
+            lines.append("\n⚠️  Focus on these error patterns:")
+            lines.extend(f"   • {pattern}" for pattern in recommendations.dangerous_patterns)
+        print("\n".join(lines))
         return recommendations
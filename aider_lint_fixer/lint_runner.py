@@ -7,6 +7,7 @@ import json
 import logging
 import re
 import subprocess
+import sys
 from dataclasses import dataclass, field
 from enum import Enum
 from typing import Any, Dict, List, Optional, Tuple
@@ -116,6 +117,14 @@ class LintError:
     context: Optional[str] = None
     fix_suggestion: Optional[str] = None
 
+    def __post_init__(self):
+        # Rule ids and linter names repeat across many errors and key most lookups,
+        # so intern them to let equal keys compare by identity
+        if type(self.rule_id) is str:
+            self.rule_id = sys.intern(self.rule_id)
+        if type(self.linter) is str:
+            self.linter = sys.intern(self.linter)
+
 
 @dataclass
 class LintResult:
@@ -616,11 +625,9 @@ class LintRunner:
         # Add file paths or project root
         if file_paths:
             # Filter files by supported extensions
-            supported_extensions = config.get("file_extensions", [])
+            supported_extensions = tuple(config.get("file_extensions", []))
             if supported_extensions:
-                filtered_files = [
-                    f for f in file_paths if any(f.endswith(ext) for ext in supported_extensions)
-                ]
+                filtered_files = [f for f in file_paths if f.endswith(supported_extensions)]
                 if not filtered_files:
                     logger.info(f"No files with supported extensions for {linter_name}")
                     return LintResult(linter=linter_name, success=True)
@@ -886,11 +893,9 @@ class LintRunner:
         # Add file paths or project root
         if file_paths:
             # Filter files by supported extensions
-            supported_extensions = config.get("file_extensions", [])
+            supported_extensions = tuple(config.get("file_extensions", []))
             if supported_extensions:
-                filtered_files = [
-                    f for f in file_paths if any(f.endswith(ext) for ext in supported_extensions)
-                ]
+                filtered_files = [f for f in file_paths if f.endswith(supported_extensions)]
                 if not filtered_files:
                     return LintResult(
                         linter=linter_name,
@@ -90,9 +90,9 @@ class BaseLinter(ABC):
             )
         # Filter files by supported extensions
         if file_paths:
-            filtered_files = [
-                f for f in file_paths if any(f.endswith(ext) for ext in self.supported_extensions)
-            ]
+            # Resolve the extension list once; str.endswith accepts a tuple
+            supported_extensions = tuple(self.supported_extensions)
+            filtered_files = [f for f in file_paths if f.endswith(supported_extensions)]
             if not filtered_files:
                 return LinterResult(
                     linter=self.name,
@@ -5,8 +5,9 @@ Tested with ESLint v8.57.1
 """
 
 import json
+import os
 import re
-from typing import List, Optional, Tuple
+from typing import Any, Dict, List, Optional, Tuple
 
 from ..lint_runner import ErrorSeverity, LintError
 from .base import BaseLinter, LinterResult
@@ -17,6 +18,11 @@ class ESLintLinter(BaseLinter):
 
     SUPPORTED_VERSIONS = ["8.57.1", "8.57", "8.5", "8.", "7."]
 
+    def __init__(self, project_root: str):
+        super().__init__(project_root)
+        # Project setup does not change during a run, so detection results are memoized
+        self._detection_cache: Dict[str, Any] = {}
+
     @property
     def name(self) -> str:
         return "eslint"
@@ -84,18 +90,27 @@ class ESLintLinter(BaseLinter):
         except Exception:
             return False
 
+    def _load_package_json(self) -> Optional[Dict[str, Any]]:
+        """Parse the project's package.json once and share it across detection checks."""
+        if "package_json" not in self._detection_cache:
+            data = None
+            package_json = os.path.join(self.project_root, "package.json")
+            if os.path.isfile(package_json):
+                try:
+                    with open(package_json, "r") as f:
+                        data = json.load(f)
+                except Exception:
+                    data = None
+            self._detection_cache["package_json"] = data if isinstance(data, dict) else None
+        return self._detection_cache["package_json"]
+
     def _should_use_npm_script(self) -> bool:
         """Check if we should use npm run lint instead of direct ESLint."""
-        package_json = self.project_root / "package.json"
-        if not package_json.exists():
+        data = self._load_package_json()
+        if data is None:
             return False
 
         try:
-            import json
-
-            with open(package_json, "r") as f:
-                data = json.load(f)
-
             scripts = data.get("scripts", {})
             # Check if there's a lint script that uses ESLint
             lint_script = scripts.get("lint", "")
@@ -110,6 +125,12 @@ class ESLintLinter(BaseLinter):
 
     def _detect_eslint_config(self) -> Optional[str]:
         """Auto-detect ESLint configuration file."""
+        if "eslint_config" not in self._detection_cache:
+            self._detection_cache["eslint_config"] = self._find_eslint_config()
+        return self._detection_cache["eslint_config"]
+
+    def _find_eslint_config(self) -> Optional[str]:
+        """Locate the ESLint configuration file in the project root."""
         config_files = [
             "eslint.config.js",  # Modern flat config (ESLint v9+)
             "eslint.config.mjs",  # ES modules flat config
@@ -122,41 +143,36 @@ class ESLintLinter(BaseLinter):
             ".eslintrc",
         ]
 
+        root = str(self.project_root)
         for config_file in config_files:
-            config_path = self.project_root / config_file
-            if config_path.exists():
-                return str(config_path)
+            config_path = os.path.join(root, config_file)
+            if os.path.exists(config_path):
+                return config_path
 
         # Check package.json for eslintConfig
-        package_json = self.project_root / "package.json"
-        if package_json.exists():
-            try:
-                import json
-
-                with open(package_json, "r") as f:
-                    data = json.load(f)
-                if "eslintConfig" in data:
-                    return str(package_json)
-            except Exception:
-                pass
+        data = self._load_package_json()
+        if data is not None and "eslintConfig" in data:
+            return os.path.join(root, "package.json")
 
         return None
 
     def _has_typescript_support(self) -> bool:
         """Check if the project has TypeScript support configured."""
+        # supported_extensions consults this on every access; only walk the tree once
+        if "typescript" not in self._detection_cache:
+            self._detection_cache["typescript"] = self._detect_typescript_support()
+        return self._detection_cache["typescript"]
+
+    def _detect_typescript_support(self) -> bool:
+        """Detect TypeScript via tsconfig.json, package.json dependencies, or source files."""
         # Check for tsconfig.json
-        if (self.project_root / "tsconfig.json").exists():
+        if os.path.exists(os.path.join(self.project_root, "tsconfig.json")):
             return True
 
         # Check for TypeScript dependencies in package.json
-        package_json = self.project_root / "package.json"
-        if package_json.exists():
+        data = self._load_package_json()
+        if data is not None:
             try:
-                import json
-
-                with open(package_json, "r") as f:
-                    data = json.load(f)
-
                 # Check dependencies and devDependencies
                 all_deps = {}
                 all_deps.update(data.get("dependencies", {}))
@@ -175,12 +191,8 @@ class ESLintLinter(BaseLinter):
             except Exception:
                 pass
 
-        # Check for .ts or .tsx files in the project
-        for ext in [".ts", ".tsx"]:
-            if any(self.project_root.rglob(f"*{ext}")):
-                return True
-
-        return False
+        # Check for .ts or .tsx files in the project with a single tree walk
+        return any(path.suffix in (".ts", ".tsx") for path in self.project_root.rglob("*"))
 
     def _can_use_json_format(self) -> bool:
         """Test if the current ESLint setup can handle --format=json properly."""
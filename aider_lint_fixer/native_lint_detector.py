@@ -8,6 +8,7 @@ to ensure our tool matches the project's own linting behavior exactly.
 
 import json
 import logging
+import os
 import subprocess
 from dataclasses import dataclass
 from pathlib import Path
@@ -16,9 +17,12 @@ from typing import Dict, List, Optional, Tuple
 logger = logging.getLogger(__name__)
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class NativeLintCommand:
-    """Represents a native lint command for a project."""
+    """Represents a native lint command for a project.
+
+    Instances are immutable once detected, so they are frozen and slotted.
+    """
 
     command: List[str]
     linter_type: str  # eslint, flake8, pylint, etc.
@@ -55,8 +59,8 @@ class NativeLintDetector:
         """Detect npm/yarn lint scripts."""
         commands = {}
 
-        package_json = self.project_root / "package.json"
-        if not package_json.exists():
+        package_json = os.path.join(self.project_root, "package.json")
+        if not os.path.isfile(package_json):
             return commands
 
         try:
@@ -113,21 +117,20 @@ class NativeLintDetector:
         """Detect Python lint scripts (poetry, pip, tox, etc.)."""
         commands = {}
 
+        root = str(self.project_root)
+
         # Check for Poetry
-        pyproject_toml = self.project_root / "pyproject.toml"
-        if pyproject_toml.exists():
+        if os.path.exists(os.path.join(root, "pyproject.toml")):
             poetry_commands = self._detect_poetry_lint_scripts()
             commands.update(poetry_commands)
 
         # Check for tox
-        tox_ini = self.project_root / "tox.ini"
-        if tox_ini.exists():
+        if os.path.exists(os.path.join(root, "tox.ini")):
             tox_commands = self._detect_tox_lint_scripts()
             commands.update(tox_commands)
 
         # Check for Makefile
-        makefile = self.project_root / "Makefile"
-        if makefile.exists():
+        if os.path.exists(os.path.join(root, "Makefile")):
             make_commands = self._detect_makefile_lint_scripts()
             commands.update(make_commands)
 
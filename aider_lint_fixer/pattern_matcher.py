@@ -10,11 +10,13 @@ import json
 import logging
 import os
 import pickle
+import sqlite3
 import tempfile
 import time
 from dataclasses import dataclass, field
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 
 try:
     import ahocorasick
@@ -33,6 +35,8 @@ except ImportError:
     SKLEARN_AVAILABLE = False
     logging.warning("scikit-learn not available, ML learning disabled")
 
+from . import __version__
+
 logger = logging.getLogger(__name__)
 
 
@@ -66,6 +70,7 @@ class LanguagePatternMatcher:
     def __init__(self):
         self.matchers = {}  # One automaton per language
         self.patterns_by_language = {}
+        self.learned_pattern_count = 0  # Patterns added at runtime by add_learned_pattern
         self._build_language_patterns()
 
     def _build_language_patterns(self):
@@ -487,6 +492,7 @@ class LanguagePatternMatcher:
         if language not in self.patterns_by_language:
             self.patterns_by_language[language] = []
         self.patterns_by_language[language].append(new_pattern)
+        self.learned_pattern_count += 1
 
         # Rebuild automaton for this language
         if AHOCORASICK_AVAILABLE:
@@ -534,6 +540,7 @@ class RuleKnowledgeBase:
 
     def __init__(self):
         self.rule_database = self._build_rule_database()
+        self.scraped_rules_file: Optional[Path] = None  # Set once scraped rules are merged
         self._load_scraped_rules()  # Load web-scraped data if available
 
     def _build_rule_database(self) -> Dict[str, Dict]:
@@ -660,6 +667,7 @@ class RuleKnowledgeBase:
                         self.rule_database[linter][rule_id] = rule_info
                         rules_added += 1
 
+                self.scraped_rules_file = scraped_file
                 logger.info(f"Loaded {rules_added} scraped rules from {scraped_file}")
             else:
                 logger.debug("No scraped rules file found")
@@ -701,6 +709,12 @@ class RuleKnowledgeBase:
 class SmartErrorClassifier:
     """Intelligent error classification using pattern matching, ML, and rule knowledge."""
 
+    # SQLite file in cache_dir holding classify_batch results across runs
+    RESULT_CACHE_FILE = "classify.sqlite"
+
+    # Keys looked up per query; three parameters each stays under SQLite's 999 limit
+    RESULT_CACHE_LOOKUP_CHUNK = 300
+
     def __init__(self, cache_dir: Optional[Path] = None):
         if cache_dir is None:
             cache_dir = Path(".aider-lint-cache")
@@ -727,6 +741,20 @@ class SmartErrorClassifier:
                 "Install with: pip install aider-lint-fixer[learning]"
             )
 
+        # Persisted batch results are only valid for the models loaded above
+        self._result_cache_path = self.cache_dir / self.RESULT_CACHE_FILE
+        self._result_cache_fingerprint = self._models_fingerprint()
+        self._result_cache_enabled = True
+        # Opened on first use and kept for the life of the classifier
+        self._result_cache_conn: Optional[sqlite3.Connection] = None
+        self._result_cache_pid: Optional[int] = None
+
+    def __getstate__(self):
+        """Drop the result cache connection, which cannot cross process boundaries."""
+        state = self.__dict__.copy()
+        state["_result_cache_conn"] = None
+        return state
+
     def extract_features(
         self, error_message: str, language: str, linter: str, rule_id: str = ""
     ) -> ErrorFeatures:
@@ -904,6 +932,171 @@ class SmartErrorClassifier:
             error_type="unknown",
         )
 
+    def classify_batch(self, errors: List[Tuple[str, str, str]]) -> List[PatternMatchResult]:
+        """Classify many errors in one call.
+
+        Args:
+            errors: (error_message, language, linter) tuples
+
+        Returns:
+            One PatternMatchResult per input, in order. Repeated inputs are
+            classified once and share the same result object. Results persist in
+            RESULT_CACHE_FILE, so later runs only classify inputs they haven't seen.
+        """
+        unique = list(dict.fromkeys(errors))
+        results = self._load_cached_results(unique)
+        new_results = {}
+        for item in unique:
+            if item not in results:
+                results[item] = new_results[item] = self.classify_error(*item)
+        if new_results:
+            self._store_cached_results(new_results)
+        return [results[item] for item in errors]
+
+    def _models_fingerprint(self) -> str:
+        """Describe what classification depends on besides the error itself."""
+        parts = [__version__, str(SKLEARN_AVAILABLE)]
+        for language in sorted(self.classifiers):
+            for kind in ("classifier", "vectorizer"):
+                model_file = self.cache_dir / f"{language}_{kind}.pkl"
+                parts.append(self._file_fingerprint(model_file, model_file.name))
+        # Scraped rules override the built-in rule database, so they count as well
+        scraped_file = self.rule_knowledge.scraped_rules_file
+        if scraped_file is not None:
+            parts.append(self._file_fingerprint(scraped_file, str(scraped_file)))
+        return "|".join(part for part in parts if part)
+
+    @staticmethod
+    def _file_fingerprint(path: Path, name: str) -> str:
+        """Identify a file's version by modification time and size ("" if missing)."""
+        try:
+            stat = path.stat()
+        except OSError:
+            return ""
+        return f"{name}:{stat.st_mtime_ns}:{stat.st_size}"
+
+    def _result_cache_usable(self) -> bool:
+        """Persisted results only apply while classification matches a fresh process."""
+        return self._result_cache_enabled and not self.pattern_matcher.learned_pattern_count
+
+    def _connect_result_cache(self) -> sqlite3.Connection:
+        """Return the persistent result cache connection, opening it on first use.
+
+        The fingerprint is checked once per connection, clearing stored results if the
+        models changed. A process forked from the owner opens its own connection.
+        """
+        if self._result_cache_conn is not None and self._result_cache_pid == os.getpid():
+            return self._result_cache_conn
+
+        conn = sqlite3.connect(self._result_cache_path, timeout=5)
+        try:
+            self._prepare_result_cache(conn)
+        except sqlite3.Error:
+            conn.close()
+            raise
+        self._result_cache_conn = conn
+        self._result_cache_pid = os.getpid()
+        return conn
+
+    def _prepare_result_cache(self, conn: sqlite3.Connection):
+        """Create the result cache tables, clearing them if the fingerprint changed."""
+        with conn:
+            conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS classify ("
+                "message TEXT, language TEXT, linter TEXT, fixable INTEGER, confidence REAL, "
+                "method TEXT, error_type TEXT, matched_pattern TEXT, "
+                "PRIMARY KEY (message, language, linter))"
+            )
+            row = conn.execute("SELECT value FROM meta WHERE key = 'fingerprint'").fetchone()
+            if row is None or row[0] != self._result_cache_fingerprint:
+                conn.execute("DELETE FROM classify")
+                conn.execute(
+                    "INSERT OR REPLACE INTO meta VALUES ('fingerprint', ?)",
+                    (self._result_cache_fingerprint,),
+                )
+
+    def _disable_result_cache(self):
+        """Stop using the result cache after an error, closing its connection."""
+        self._result_cache_enabled = False
+        if self._result_cache_conn is not None and self._result_cache_pid == os.getpid():
+            self._result_cache_conn.close()
+        self._result_cache_conn = None
+
+    @staticmethod
+    def _is_cacheable(item: Tuple[str, str, str]) -> bool:
+        """Only non-empty string keys are persisted; the rest classify trivially."""
+        message, language, linter = item
+        return bool(message and language) and all(isinstance(part, str) for part in item)
+
+    def _load_cached_results(
+        self, items: List[Tuple[str, str, str]]
+    ) -> Dict[Tuple[str, str, str], PatternMatchResult]:
+        """Fetch persisted results for items classified by earlier runs."""
+        items = [item for item in items if self._is_cacheable(item)]
+        if not items or not self._result_cache_usable():
+            return {}
+
+        results = {}
+        try:
+            conn = self._connect_result_cache()
+            chunk_size = self.RESULT_CACHE_LOOKUP_CHUNK
+            for start in range(0, len(items), chunk_size):
+                chunk = items[start : start + chunk_size]
+                keys = ", ".join(["(?, ?, ?)"] * len(chunk))
+                # CROSS JOIN keeps the keys as the outer loop, so each is a primary key search
+                rows = conn.execute(
+                    f"WITH keys (message, language, linter) AS (VALUES {keys}) "
+                    "SELECT c.message, c.language, c.linter, c.fixable, c.confidence, c.method, "
+                    "c.error_type, c.matched_pattern FROM keys CROSS JOIN classify AS c "
+                    "ON c.message = keys.message AND c.language = keys.language "
+                    "AND c.linter = keys.linter",
+                    [part for item in chunk for part in item],
+                )
+                for *key, fixable, confidence, method, error_type, matched_pattern in rows:
+                    results[tuple(key)] = PatternMatchResult(
+                        fixable=bool(fixable),
+                        confidence=confidence,
+                        method=method,
+                        error_type=error_type,
+                        matched_pattern=matched_pattern,
+                    )
+        except (sqlite3.Error, OSError) as e:
+            logger.debug(f"Classification result cache unavailable: {e}")
+            self._disable_result_cache()
+            return {}
+        return results
+
+    def _store_cached_results(self, results: Dict[Tuple[str, str, str], PatternMatchResult]):
+        """Persist newly classified results in a single transaction."""
+        if not self._result_cache_usable():
+            return
+
+        rows = [
+            (
+                *item,
+                int(bool(result.fixable)),
+                float(result.confidence),
+                result.method,
+                result.error_type,
+                result.matched_pattern,
+            )
+            for item, result in results.items()
+            if self._is_cacheable(item)
+        ]
+        if not rows:
+            return
+
+        try:
+            conn = self._connect_result_cache()
+            with conn:
+                conn.executemany(
+                    "INSERT OR REPLACE INTO classify VALUES (?, ?, ?, ?, ?, ?, ?, ?)", rows
+                )
+        except (sqlite3.Error, OSError) as e:
+            logger.debug(f"Could not persist classification results: {e}")
+            self._disable_result_cache()
+
     def _get_fallback_fixability(self, linter: str, error_message: str) -> bool:
         """Conservative fallback for determining fixability."""
         # Formatters are usually always fixable
@@ -999,6 +1192,10 @@ class SmartErrorClassifier:
         if not SKLEARN_AVAILABLE:
             return
 
+        # Patterns learned in memory make this process classify differently from the
+        # persisted results; retrained models change the fingerprint for later runs
+        self._result_cache_enabled = False
+
         # Store training data with file locking for thread safety
         training_file = self.cache_dir / f"{language}_training.json"
 
@@ -1314,8 +1511,12 @@ class SmartErrorClassifier:
             self._load_models()
 
 
+@lru_cache(maxsize=4096)
 def detect_language_from_file_path(file_path: str) -> str:
-    """Detect programming language from file path."""
+    """Detect programming language from file path.
+
+    Results are cached, since the same path is looked up once per error.
+    """
     path = Path(file_path)
     extension = path.suffix.lower()
 
@@ -470,6 +470,21 @@ def test_function():
         assert len(analysis.control_flow_graph) == 0
         assert len(analysis.control_structures) == 0
 
+    def test_analyze_preloaded_content(self):
+        """Test that preloaded content is analyzed without reading the file."""
+        python_code = """
+def test_function(x):
+    if x > 0:
+        return x
+    return -x
+"""
+
+        analysis = self.analyzer.analyze_file("not_on_disk.py", content=python_code)
+
+        assert analysis.file_path == "not_on_disk.py"
+        assert len(analysis.control_flow_graph) > 0
+        assert any(s.structure_type == "if" for s in analysis.control_structures)
+
 
 if __name__ == "__main__":
     pytest.main([__file__])
@@ -17,9 +17,11 @@ from unittest.mock import MagicMock, patch
 import pytest
 
 from aider_lint_fixer.error_analyzer import (
+    NUMPY_AVAILABLE,
     ErrorAnalysis,
     ErrorAnalyzer,
     ErrorCategory,
+    FileAnalysis,
     FixComplexity,
 )
 from aider_lint_fixer.lint_runner import ErrorSeverity, LintError, LintResult
@@ -459,5 +461,491 @@ class TestEnhancedErrorAnalyzer:
                     assert len(file_analysis.error_analyses) > 0
 
 
+class TestErrorCategorization:
+    """Test rule and message based error categorization."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.analyzer = ErrorAnalyzer(project_path=self.temp_dir)
+
+    def _make_error(self, message, rule_id="", linter="unknown-linter"):
+        return LintError(
+            file_path="test.py",
+            line=1,
+            column=1,
+            rule_id=rule_id,
+            message=message,
+            severity=ErrorSeverity.WARNING,
+            linter=linter,
+        )
+
+    def test_message_keyword_priority_order(self):
+        """Earlier keyword groups win even when a later keyword appears first."""
+        error = self._make_error("Naming style of the imported module")
+        assert self.analyzer._categorize_error(error) == ErrorCategory.IMPORT
+
+        error = self._make_error("too many spaces, wrong indent")
+        assert self.analyzer._categorize_error(error) == ErrorCategory.FORMATTING
+
+        error = self._make_error("nothing recognizable here")
+        assert self.analyzer._categorize_error(error) == ErrorCategory.OTHER
+
+    def test_message_keyword_fallback_without_automaton(self):
+        """Keyword categorization gives the same answers without pyahocorasick."""
+        self.analyzer._message_automaton = None
+
+        error = self._make_error("Naming style of the imported module")
+        assert self.analyzer._categorize_error(error) == ErrorCategory.IMPORT
+
+        error = self._make_error("Function is too complex")
+        assert self.analyzer._categorize_error(error) == ErrorCategory.COMPLEXITY
+
+        error = self._make_error("nothing recognizable here")
+        assert self.analyzer._categorize_error(error) == ErrorCategory.OTHER
+
+    def test_rule_patterns_take_precedence(self):
+        """Rule id patterns are matched case-insensitively before message keywords."""
+        error = self._make_error("name is unused", rule_id="f401", linter="flake8")
+        assert self.analyzer._categorize_error(error) == ErrorCategory.IMPORT
+
+        error = self._make_error("expected type annotation", rule_id="Indent", linter="eslint")
+        assert self.analyzer._categorize_error(error) == ErrorCategory.FORMATTING
+
+    def test_rule_patterns_without_automaton(self):
+        """Rule categorization gives the same answers without pyahocorasick."""
+        with_automata = [
+            self.analyzer._categorize_error(self._make_error("msg", rule_id=rule_id, linter=linter))
+            for linter, categories in ErrorAnalyzer.RULE_CATEGORIES.items()
+            for patterns in categories.values()
+            for rule_id in patterns
+        ]
+        self.analyzer._rule_automata = {}
+        without_automata = [
+            self.analyzer._categorize_error(self._make_error("msg", rule_id=rule_id, linter=linter))
+            for linter, categories in ErrorAnalyzer.RULE_CATEGORIES.items()
+            for patterns in categories.values()
+            for rule_id in patterns
+        ]
+
+        assert with_automata == without_automata
+
+    def test_classification_memoized_per_signature(self):
+        """Errors sharing a signature are classified once, regardless of line."""
+        first = self._make_error("missing whitespace after ','", rule_id="E231", linter="flake8")
+        second = self._make_error("missing whitespace after ','", rule_id="E231", linter="flake8")
+        second.line = 42
+
+        with patch.object(
+            self.analyzer, "_categorize_error", wraps=self.analyzer._categorize_error
+        ) as categorize:
+            analysis1 = self.analyzer._analyze_error(first, None)
+            analysis2 = self.analyzer._analyze_error(second, None)
+
+        assert categorize.call_count == 1
+        assert analysis1.category == analysis2.category == ErrorCategory.FORMATTING
+        assert analysis1.fixable == analysis2.fixable
+
+    def test_learning_invalidates_classification_cache(self):
+        """Recording a fix outcome drops memoized classifications."""
+        error = self._make_error("line too long (120 > 79)", rule_id="E501", linter="flake8")
+        self.analyzer._analyze_error(error, None)
+        assert self.analyzer._classification_cache
+
+        self.analyzer.learn_from_fix_result(error, fix_successful=True)
+        assert not self.analyzer._classification_cache
+
+    def test_classification_cache_evicts_oldest(self):
+        """The memoized classifications are capped, dropping the oldest first."""
+        self.analyzer.CLASSIFICATION_CACHE_SIZE = 2
+        for rule_id in ("E501", "E231", "W291"):
+            self.analyzer._analyze_error(
+                self._make_error("some message", rule_id=rule_id, linter="flake8"), None
+            )
+
+        cached_rules = [key[1] for key in self.analyzer._classification_cache]
+        assert cached_rules == ["E231", "W291"]
+
+    def test_priority_table_matches_mappings(self):
+        """Precomputed priorities equal the clamped severity plus category adjustment."""
+        for severity in ErrorSeverity:
+            error = self._make_error("anything")
+            error.severity = severity
+            for category in ErrorCategory:
+                expected = max(
+                    1,
+                    min(
+                        10,
+                        ErrorAnalyzer.PRIORITY_MAPPING[severity]
+                        + ErrorAnalyzer.CATEGORY_PRIORITY_ADJUSTMENTS.get(category, 0),
+                    ),
+                )
+                assert self.analyzer._calculate_priority(error, category) == expected
+
+    def test_trivial_errors_skip_smart_classifier(self):
+        """Trivial formatting errors are fixable without consulting the classifier."""
+        error = self._make_error("trailing whitespace", rule_id="W291", linter="flake8")
+
+        classifier = self.analyzer.smart_classifier
+        with (
+            patch.object(classifier, "classify_error") as classify,
+            patch.object(classifier, "classify_batch") as classify_batch,
+        ):
+            assert self.analyzer._classify_messages([error]) == {}
+            analysis = self.analyzer._analyze_error(error, None)
+
+        classify.assert_not_called()
+        classify_batch.assert_not_called()
+        assert analysis.complexity == FixComplexity.TRIVIAL
+        assert analysis.fixable is True
+
+    def test_batch_classification_categorizes_each_error_once(self):
+        """Category computed for the classifier batch is reused by _classify_error."""
+        errors = [
+            self._make_error("trailing whitespace", rule_id="W291", linter="flake8"),
+            self._make_error("undefined name 'foo'", rule_id="F821", linter="flake8"),
+        ]
+
+        assessments = {}
+        with patch.object(
+            self.analyzer, "_categorize_error", wraps=self.analyzer._categorize_error
+        ) as categorize:
+            results = self.analyzer._classify_messages(errors, assessments)
+            analyses = [
+                self.analyzer._analyze_error(
+                    error, None, classifier_results=results, assessments=assessments
+                )
+                for error in errors
+            ]
+
+        assert categorize.call_count == 2
+        assert [a.category for a in analyses] == [
+            assessment[0] for assessment in assessments.values()
+        ]
+
+
+class TestFileContext:
+    """Test file loading and context extraction."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.analyzer = ErrorAnalyzer(project_path=self.temp_dir)
+
+    def _make_error(self, line):
+        return LintError(
+            file_path="sample.py",
+            line=line,
+            column=1,
+            rule_id="E231",
+            message="missing whitespace after ','",
+            severity=ErrorSeverity.WARNING,
+            linter="flake8",
+        )
+
+    def test_context_lines_for_each_error(self):
+        """Each error gets its own window of numbered context lines."""
+        content = "\n".join(f"line_{i}" for i in range(1, 11))
+        with open(f"{self.temp_dir}/sample.py", "w") as f:
+            f.write(content)
+
+        file_analysis = self.analyzer._analyze_file(
+            "sample.py", [self._make_error(1), self._make_error(5)]
+        )
+
+        first, second = file_analysis.error_analyses
+        assert first.context_lines[0] == ">>>    1: line_1"
+        assert len(first.context_lines) == 4
+        assert ">>>    5: line_5" in second.context_lines
+        assert len(second.context_lines) == 7
+
+    def test_context_without_shared_lines(self):
+        """Context extracted from raw content matches context from pre-split lines."""
+        content = "\n".join(f"line_{i}" for i in range(1, 21))
+        lines = content.split("\n")
+
+        for line in (1, 2, 10, 17, 18, 20, 25):
+            error = self._make_error(line)
+            assert self.analyzer._extract_context(error, content) == (
+                self.analyzer._extract_context(error, content, lines)
+            )
+
+    def test_prefetched_contents_match_sequential_reads(self):
+        """Files read by the thread pool match files read one at a time."""
+        for name in ("a.py", "b.py"):
+            with open(f"{self.temp_dir}/{name}", "w") as f:
+                f.write(f"# {name}\n")
+        errors_by_file = {path: [self._make_error(1)] for path in ("a.py", "b.py", "missing.py")}
+
+        contents = self.analyzer._read_files(errors_by_file)
+
+        assert contents == {path: self.analyzer._read_file_safe(path) for path in errors_by_file}
+        assert contents["a.py"] == ("# a.py\n", True)
+        assert contents["missing.py"] == ("", False)
+        assert self.analyzer._read_files({"a.py": [self._make_error(1)]}) == {}
+
+    def test_file_level_errors_skip_reading(self):
+        """Files whose errors have no line number are checked for existence only."""
+        with open(f"{self.temp_dir}/sample.py", "w") as f:
+            f.write("a = 1\n")
+
+        file_analysis = self.analyzer._analyze_file("sample.py", [self._make_error(0)])
+        assert file_analysis.file_content == ""
+        assert file_analysis.file_exists is True
+        assert file_analysis.error_analyses[0].context_lines == []
+
+        file_analysis = self.analyzer._analyze_file("missing.py", [self._make_error(0)])
+        assert file_analysis.file_exists is False
+
+    def test_large_files_read_up_to_last_context_line(self):
+        """Large files are only read as far as their errors' context reaches."""
+        with open(f"{self.temp_dir}/sample.py", "w") as f:
+            f.write("\n".join(f"line_{i}" for i in range(1, 101)))
+        errors = [self._make_error(2), self._make_error(10)]
+        full = self.analyzer._analyze_file("sample.py", errors)
+
+        self.analyzer.LARGE_FILE_BYTES = 0
+        partial = self.analyzer._analyze_file("sample.py", errors)
+
+        assert partial.file_content.split("\n")[-2:] == ["line_13", ""]
+        assert [a.context_lines for a in partial.error_analyses] == [
+            a.context_lines for a in full.error_analyses
+        ]
+
+    def test_undecodable_bytes_are_replaced(self):
+        """Files that are not valid UTF-8 are still read for context."""
+        with open(f"{self.temp_dir}/sample.py", "wb") as f:
+            f.write(b"x = '\xff'\ny = 2\n")
+
+        file_analysis = self.analyzer._analyze_file("sample.py", [self._make_error(2)])
+
+        assert file_analysis.file_exists is True
+        assert ">>>    2: y = 2" in file_analysis.error_analyses[0].context_lines
+
+    def test_control_flow_insights_fetched_once_per_line(self):
+        """Errors sharing a line share one control flow insights lookup."""
+        with open(f"{self.temp_dir}/sample.py", "w") as f:
+            f.write("a = 1\nb = 2\n")
+
+        errors = [self._make_error(1 + i % 2) for i in range(8)]
+        insights = {"complexity": "low", "reachable": True}
+        with (
+            patch.object(self.analyzer, "_get_control_flow_analysis", return_value=MagicMock()),
+            patch.object(
+                self.analyzer.control_flow_analyzer,
+                "get_control_flow_insights",
+                return_value=insights,
+            ) as mock_insights,
+        ):
+            file_analysis = self.analyzer._analyze_file("sample.py", errors)
+
+        assert mock_insights.call_count == 2
+        assert all(
+            analysis.control_flow_context == insights for analysis in file_analysis.error_analyses
+        )
+
+
+class TestRelatedErrors:
+    """Test related error detection."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.analyzer = ErrorAnalyzer(project_path=tempfile.mkdtemp())
+
+    @pytest.mark.parametrize("pair_scan_threshold", [0, 100])
+    def test_matches_pairwise_definition(self, pair_scan_threshold):
+        """Bucketed and pairwise lookups find exactly the pairs _are_related accepts."""
+        specs = [
+            (1, "F401", "'os' imported but unused"),
+            (2, "E231", "missing whitespace after ','"),
+            (2, "", "Unable to import 'foo'"),
+            (5, "E231", "missing whitespace after ','"),
+            (9, "", None),
+            (10, "W291", "trailing whitespace"),
+            (20, "F401", "'sys' imported but unused"),
+            (30, "", "Some other problem"),
+        ]
+        analyses = [
+            ErrorAnalysis(
+                error=LintError(
+                    file_path="module.py",
+                    line=line,
+                    column=1,
+                    rule_id=rule_id,
+                    message=message,
+                    severity=ErrorSeverity.WARNING,
+                    linter="flake8",
+                ),
+                category=ErrorCategory.OTHER,
+                complexity=FixComplexity.SIMPLE,
+                priority=5,
+                fixable=True,
+            )
+            for line, rule_id, message in specs
+        ]
+
+        with patch.object(ErrorAnalyzer, "RELATED_PAIR_SCAN_THRESHOLD", pair_scan_threshold):
+            self.analyzer._find_related_errors(analyses)
+
+        for i, analysis in enumerate(analyses):
+            expected = [
+                other.error
+                for j, other in enumerate(analyses)
+                if i != j and self.analyzer._are_related(analysis.error, other.error)
+            ]
+            assert [id(e) for e in analysis.related_errors] == [id(e) for e in expected]
+        assert analyses[-1].related_errors == []
+
+
+class TestPrioritizedErrors:
+    """Test ordering of errors for fixing."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.analyzer = ErrorAnalyzer(project_path=tempfile.mkdtemp())
+
+    def _make_file_analyses(self, count):
+        complexities = list(FixComplexity)
+        analyses = [
+            ErrorAnalysis(
+                error=LintError(
+                    file_path="module.py",
+                    line=(i * 7) % 13 + 1,
+                    column=1,
+                    rule_id="E231",
+                    message="missing whitespace after ','",
+                    severity=ErrorSeverity.WARNING,
+                    linter="flake8",
+                ),
+                category=ErrorCategory.FORMATTING,
+                complexity=complexities[i % len(complexities)],
+                priority=(5, 8, 9.0, 2)[i % 4],
+                fixable=i % 3 != 0,
+            )
+            for i in range(count)
+        ]
+        return {
+            "module.py": FileAnalysis(
+                file_path="module.py", total_errors=count, error_analyses=analyses
+            )
+        }
+
+    def test_orders_fixable_errors_by_priority(self):
+        """Fixable errors come back by priority, complexity, then line."""
+        prioritized = self.analyzer.get_prioritized_errors(self._make_file_analyses(12))
+
+        assert all(a.fixable for a in prioritized)
+        keys = [(-a.priority, a.complexity.value, a.error.line) for a in prioritized]
+        assert keys == sorted(keys)
+
+    def test_small_limit_matches_full_sort(self):
+        """Selecting a few top errors returns the head of the full ordering."""
+        file_analyses = self._make_file_analyses(200)
+
+        full = self.analyzer.get_prioritized_errors(file_analyses)
+        top = self.analyzer.get_prioritized_errors(file_analyses, max_errors=5)
+
+        assert [id(a) for a in top] == [id(a) for a in full[:5]]
+
+    @pytest.mark.skipif(not NUMPY_AVAILABLE, reason="numpy not available")
+    def test_lexsort_matches_list_sort(self):
+        """The NumPy ordering is identical to the list sort, ties included."""
+        file_analyses = self._make_file_analyses(200)
+
+        with patch.object(ErrorAnalyzer, "NUMPY_SORT_THRESHOLD", 10**9):
+            expected = self.analyzer.get_prioritized_errors(file_analyses, max_errors=150)
+        with patch.object(ErrorAnalyzer, "NUMPY_SORT_THRESHOLD", 0):
+            actual = self.analyzer.get_prioritized_errors(file_analyses, max_errors=150)
+
+        assert [id(a) for a in actual] == [id(a) for a in expected]
+
+
+class TestParallelFileAnalysis:
+    """Test process-parallel per-file analysis."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.temp_dir = tempfile.mkdtemp()
+
+    def _make_results(self, file_count):
+        errors = [
+            LintError(
+                file_path=f"module_{i % file_count}.py",
+                line=i % 7 + 1,
+                column=1,
+                rule_id="E231" if i % 2 else "F401",
+                message="missing whitespace after ','" if i % 2 else "'os' imported but unused",
+                severity=ErrorSeverity.WARNING,
+                linter="flake8",
+            )
+            for i in range(file_count * 3)
+        ]
+        return errors, {"flake8": LintResult(linter="flake8", success=True, errors=errors)}
+
+    def test_parallel_matches_sequential(self):
+        """Parallel analysis returns the same analyses as sequential analysis."""
+        errors, results = self._make_results(ErrorAnalyzer.PARALLEL_FILE_THRESHOLD + 2)
+
+        sequential_analyzer = ErrorAnalyzer(project_path=self.temp_dir, max_workers=1)
+        parallel_analyzer = ErrorAnalyzer(project_path=self.temp_dir, max_workers=2)
+        parallel_analyzer.PARALLEL_ERROR_THRESHOLD = 0
+        sequential = sequential_analyzer.analyze_errors(results)
+        parallel = parallel_analyzer.analyze_errors(results)
+
+        assert list(parallel) == list(sequential)
+        for file_path, file_analysis in sequential.items():
+            parallel_analyses = parallel[file_path].error_analyses
+            assert len(parallel_analyses) == len(file_analysis.error_analyses)
+            for expected, actual in zip(file_analysis.error_analyses, parallel_analyses):
+                # Analyses must reference the caller's LintError objects, not copies
+                assert actual.error is expected.error
+                assert [id(e) for e in actual.related_errors] == [
+                    id(e) for e in expected.related_errors
+                ]
+                assert actual.category == expected.category
+                assert actual.fixable == expected.fixable
+                assert actual.priority == expected.priority
+
+    def test_parallel_failure_falls_back_to_sequential(self):
+        """A broken process pool does not lose the analysis."""
+        _, results = self._make_results(ErrorAnalyzer.PARALLEL_FILE_THRESHOLD + 1)
+        analyzer = ErrorAnalyzer(project_path=self.temp_dir, max_workers=2)
+        analyzer.PARALLEL_ERROR_THRESHOLD = 0
+
+        with patch(
+            "aider_lint_fixer.error_analyzer.ProcessPoolExecutor",
+            side_effect=OSError("no processes"),
+        ):
+            file_analyses = analyzer.analyze_errors(results)
+
+        assert len(file_analyses) == ErrorAnalyzer.PARALLEL_FILE_THRESHOLD + 1
+
+    def test_single_cpu_stays_sequential(self):
+        """With one CPU there is nothing to parallelize, so no pool is started."""
+        _, results = self._make_results(ErrorAnalyzer.PARALLEL_FILE_THRESHOLD + 2)
+        analyzer = ErrorAnalyzer(project_path=self.temp_dir)
+        analyzer.PARALLEL_ERROR_THRESHOLD = 0
+
+        with (
+            patch("aider_lint_fixer.error_analyzer.os.cpu_count", return_value=1),
+            patch("aider_lint_fixer.error_analyzer.ProcessPoolExecutor") as pool,
+        ):
+            file_analyses = analyzer.analyze_errors(results)
+
+        pool.assert_not_called()
+        assert len(file_analyses) == ErrorAnalyzer.PARALLEL_FILE_THRESHOLD + 2
+
+    def test_few_errors_stay_sequential(self):
+        """Runs below the error threshold are not worth a process pool."""
+        _, results = self._make_results(ErrorAnalyzer.PARALLEL_FILE_THRESHOLD + 2)
+        analyzer = ErrorAnalyzer(project_path=self.temp_dir, max_workers=4)
+
+        with patch("aider_lint_fixer.error_analyzer.ProcessPoolExecutor") as pool:
+            file_analyses = analyzer.analyze_errors(results)
+
+        pool.assert_not_called()
+        assert len(file_analyses) == ErrorAnalyzer.PARALLEL_FILE_THRESHOLD + 2
+
+
 if __name__ == "__main__":
     pytest.main([__file__])
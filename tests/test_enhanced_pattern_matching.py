@@ -9,8 +9,11 @@ This test module:
 """
 
 import json
+import pickle
+import sqlite3
 import time
 from pathlib import Path
+from unittest.mock import patch
 
 import pytest
 
@@ -633,3 +636,122 @@ class TestMLLearningSystem:
 
         except json.JSONDecodeError:
             pytest.fail("Training file should not be corrupted by concurrent access")
+
+
+class TestBatchClassification:
+    """Test the batched classification entry point."""
+
+    def test_classify_batch_matches_classify_error(self, tmp_path):
+        """Batch results match one-at-a-time classification, in input order."""
+        classifier = SmartErrorClassifier(tmp_path / "cache")
+        items = [
+            ("line too long (130 > 120 characters)", "python", "flake8"),
+            ("'os' imported but unused", "python", "flake8"),
+            ("line too long (130 > 120 characters)", "python", "flake8"),
+            ("", "python", "flake8"),
+        ]
+
+        results = classifier.classify_batch(items)
+
+        assert len(results) == len(items)
+        for item, result in zip(items, results):
+            expected = classifier.classify_error(*item)
+            assert (result.fixable, result.confidence, result.method) == (
+                expected.fixable,
+                expected.confidence,
+                expected.method,
+            )
+        # Repeated inputs are classified once and share a result
+        assert results[0] is results[2]
+
+    def test_classify_batch_empty(self, tmp_path):
+        """An empty batch returns an empty list."""
+        classifier = SmartErrorClassifier(tmp_path / "cache")
+        assert classifier.classify_batch([]) == []
+
+    def test_classify_batch_persists_results(self, tmp_path):
+        """A later classifier on the same cache reuses earlier batch results."""
+        items = [("'os' imported but unused", "python", "flake8"), ("", "python", "flake8")]
+        first = SmartErrorClassifier(tmp_path / "cache").classify_batch(items)
+
+        classifier = SmartErrorClassifier(tmp_path / "cache")
+        with patch.object(
+            classifier, "classify_error", wraps=classifier.classify_error
+        ) as classify_error:
+            second = classifier.classify_batch(items)
+
+        # Only the empty message, which is never persisted, is classified again
+        assert classify_error.call_count == 1
+        assert [(r.fixable, r.confidence, r.method) for r in second] == [
+            (r.fixable, r.confidence, r.method) for r in first
+        ]
+
+    def test_result_cache_cleared_when_models_change(self, tmp_path):
+        """Persisted results are dropped when the fingerprint no longer matches."""
+        items = [("'os' imported but unused", "python", "flake8")]
+        SmartErrorClassifier(tmp_path / "cache").classify_batch(items)
+
+        classifier = SmartErrorClassifier(tmp_path / "cache")
+        classifier._result_cache_fingerprint += "|retrained"
+        assert classifier._load_cached_results(items) == {}
+
+    def test_result_cache_cleared_when_scraped_rules_change(self, tmp_path, monkeypatch):
+        """Updating scraped_rules.json invalidates persisted results."""
+        monkeypatch.chdir(tmp_path)
+        scraped_file = tmp_path / "scraped_rules.json"
+        scraped_file.write_text(json.dumps({"flake8": {"F401": {"auto_fixable": True}}}))
+        items = [("'os' imported but unused", "python", "flake8")]
+        SmartErrorClassifier(tmp_path / "cache").classify_batch(items)
+
+        scraped_file.write_text(json.dumps({"flake8": {"F401": {"auto_fixable": False}}}))
+        classifier = SmartErrorClassifier(tmp_path / "cache")
+
+        assert classifier.rule_knowledge.scraped_rules_file is not None
+        assert classifier._load_cached_results(items) == {}
+
+    def test_result_cache_bypassed_after_learned_pattern(self, tmp_path):
+        """Patterns learned at runtime make persisted results unreliable."""
+        items = [("'os' imported but unused", "python", "flake8")]
+        SmartErrorClassifier(tmp_path / "cache").classify_batch(items)
+
+        classifier = SmartErrorClassifier(tmp_path / "cache")
+        classifier.pattern_matcher.add_learned_pattern(
+            "imported but unused", "learned", "python", "flake8", fixable=False, confidence=0.99
+        )
+        with patch.object(
+            classifier, "classify_error", wraps=classifier.classify_error
+        ) as classify_error:
+            classifier.classify_batch(items)
+
+        assert classify_error.call_count == 1
+
+    def test_result_cache_connection_reused_across_batches(self, tmp_path):
+        """One connection serves every batch, and lookups span query chunks."""
+        items = [(f"unused import 'mod{i}'", "python", "flake8") for i in range(7)]
+        SmartErrorClassifier(tmp_path / "cache").classify_batch(items)
+
+        classifier = SmartErrorClassifier(tmp_path / "cache")
+        classifier.RESULT_CACHE_LOOKUP_CHUNK = 3
+        with (
+            patch(
+                "aider_lint_fixer.pattern_matcher.sqlite3.connect", wraps=sqlite3.connect
+            ) as connect,
+            patch.object(classifier, "classify_error") as classify_error,
+        ):
+            for _ in range(3):
+                classifier.classify_batch(items)
+
+        connect.assert_called_once()
+        classify_error.assert_not_called()
+
+    def test_classifier_pickles_without_result_cache_connection(self, tmp_path):
+        """Worker processes receive the classifier without the parent's connection."""
+        items = [("'os' imported but unused", "python", "flake8")]
+        classifier = SmartErrorClassifier(tmp_path / "cache")
+        classifier.classify_batch(items)
+
+        copy = pickle.loads(pickle.dumps(classifier))
+
+        assert copy._result_cache_conn is None
+        assert classifier._result_cache_conn is not None
+        assert copy._load_cached_results(items).keys() == {items[0]}
@@ -13,12 +13,20 @@ from unittest.mock import MagicMock, Mock, patch
 
 import numpy as np
 
-from aider_lint_fixer.error_analyzer import ErrorAnalysis, ErrorSeverity
+from aider_lint_fixer.error_analyzer import (
+    ErrorAnalysis,
+    ErrorCategory,
+    ErrorSeverity,
+    FixComplexity,
+)
 from aider_lint_fixer.intelligent_force_mode import (
     BatchPlan,
     ForceDecision,
     IntelligentForceMode,
+    _path_features,
+    _top_k_order,
 )
+from aider_lint_fixer.lint_runner import LintError
 
 
 class TestForceDecision(unittest.TestCase):
@@ -176,7 +184,8 @@ class TestIntelligentForceMode(unittest.TestCase):
              patch.object(self.force_mode, '_create_execution_strategy') as mock_strategy:
             
             mock_decisions = [Mock(), Mock()]
-            mock_predict.return_value = mock_decisions
+            mock_features = np.zeros((2, 4), dtype=np.float32)
+            mock_predict.return_value = (mock_decisions, mock_features)
             mock_batch_plan = [Mock()]
             mock_optimize.return_value = mock_batch_plan
             mock_strategy.return_value = {"test": "strategy"}
@@ -185,9 +194,12 @@ class TestIntelligentForceMode(unittest.TestCase):
             
             self.assertEqual(result, {"test": "strategy"})
             mock_predict.assert_called_once_with(error_analyses)
-            mock_build.assert_called_once_with(error_analyses)
+            mock_build.assert_called_once_with(
+                error_analyses, {"test.py": ["max-len", "no-unused-vars"]}
+            )
             mock_cascades.assert_called_once_with(mock_decisions)
-            mock_optimize.assert_called_once_with(mock_decisions, False)  # Not chaotic
+            # Not chaotic
+            mock_optimize.assert_called_once_with(mock_decisions, False, mock_features)
             mock_strategy.assert_called_once_with(mock_decisions, mock_batch_plan, False)
 
     @patch('aider_lint_fixer.intelligent_force_mode.logger')
@@ -202,7 +214,8 @@ class TestIntelligentForceMode(unittest.TestCase):
              patch.object(self.force_mode, '_create_execution_strategy') as mock_strategy:
             
             mock_decisions = [Mock() for _ in range(150)]
-            mock_predict.return_value = mock_decisions
+            mock_features = np.zeros((150, 4), dtype=np.float32)
+            mock_predict.return_value = (mock_decisions, mock_features)
             mock_batch_plan = [Mock()]
             mock_optimize.return_value = mock_batch_plan
             mock_strategy.return_value = {"chaotic": True}
@@ -210,7 +223,8 @@ class TestIntelligentForceMode(unittest.TestCase):
             result = self.force_mode.analyze_force_strategy(error_analyses)
             
             self.assertEqual(result, {"chaotic": True})
-            mock_optimize.assert_called_once_with(mock_decisions, True)  # Is chaotic
+            # Is chaotic
+            mock_optimize.assert_called_once_with(mock_decisions, True, mock_features)
             mock_strategy.assert_called_once_with(mock_decisions, mock_batch_plan, True)
 
     def test_predict_force_decisions_safe_rules(self):
@@ -221,23 +235,51 @@ class TestIntelligentForceMode(unittest.TestCase):
             self._create_mock_error_analysis(rule_id="quotes"),
         ]
         
-        with patch.object(self.force_mode, '_extract_error_features') as mock_extract, \
+        with patch.object(self.force_mode, '_extract_feature_matrix') as mock_extract, \
              patch.object(self.force_mode, '_get_base_confidence') as mock_base, \
-             patch.object(self.force_mode, '_predict_ml_confidence') as mock_ml, \
+             patch.object(self.force_mode, '_predict_ml_confidences') as mock_ml, \
              patch.object(self.force_mode, '_identify_risk_factors') as mock_risk:
             
-            mock_extract.return_value = np.array([1, 2, 3])
             mock_base.return_value = 0.75
-            mock_ml.return_value = 0.80
             mock_risk.return_value = []
             
-            decisions = self.force_mode._predict_force_decisions(error_analyses)
+            decisions, _ = self.force_mode._predict_force_decisions(error_analyses)
             
+            # Safe auto-force rules skip feature extraction and the ML model
+            mock_extract.assert_not_called()
+            mock_ml.assert_not_called()
             self.assertEqual(len(decisions), 3)
             # Safe rules with confidence >= 0.70 should be auto_force
             for decision in decisions:
                 self.assertEqual(decision.action, "auto_force")
-                self.assertAlmostEqual(decision.confidence, 0.765, places=2)  # 0.7 * 0.75 + 0.3 * 0.80
+            self.assertAlmostEqual(decisions[0].confidence, 0.795)  # 0.7 * 0.75 + 0.3 * 0.9
+            self.assertAlmostEqual(decisions[1].confidence, 0.705)  # 0.7 * 0.75 + 0.3 * 0.6
+            self.assertAlmostEqual(decisions[2].confidence, 0.705)
+
+    def test_predict_force_decisions_safe_rule_shortcut_matches_ml(self):
+        """Skipping ML for safe rules yields the same confidences as scoring every row."""
+        error_analyses = [
+            self._create_mock_error_analysis(rule_id=rule_id, fixable=fixable)
+            for rule_id in ("max-len", "semi", "no-unde", "no-unused-vars", "other", "quotes")
+            for fixable in (True, False)
+        ]
+
+        with patch.object(
+            self.force_mode,
+            '_extract_feature_matrix',
+            wraps=self.force_mode._extract_feature_matrix,
+        ) as mock_extract:
+            decisions, _ = self.force_mode._predict_force_decisions(error_analyses)
+
+        self.assertEqual(len(mock_extract.call_args[0][0]), 4)
+        ml_confidences = self.force_mode._predict_ml_confidences(
+            self.force_mode._extract_feature_matrix(error_analyses)
+        )
+        for decision, error_analysis, ml_confidence in zip(
+            decisions, error_analyses, ml_confidences
+        ):
+            base_confidence = self.force_mode._get_base_confidence(error_analysis)
+            self.assertEqual(decision.confidence, 0.7 * base_confidence + 0.3 * ml_confidence)
 
     def test_predict_force_decisions_confidence_thresholds(self):
         """Test _predict_force_decisions with different confidence thresholds."""
@@ -245,36 +287,36 @@ class TestIntelligentForceMode(unittest.TestCase):
             self._create_mock_error_analysis(rule_id="test-rule"),
         ]
         
-        with patch.object(self.force_mode, '_extract_error_features') as mock_extract, \
+        with patch.object(self.force_mode, '_extract_feature_matrix') as mock_extract, \
              patch.object(self.force_mode, '_get_base_confidence') as mock_base, \
-             patch.object(self.force_mode, '_predict_ml_confidence') as mock_ml, \
+             patch.object(self.force_mode, '_predict_ml_confidences') as mock_ml, \
              patch.object(self.force_mode, '_identify_risk_factors') as mock_risk:
             
-            mock_extract.return_value = np.array([1, 2, 3])
+            mock_extract.return_value = np.zeros((1, 16))
             mock_risk.return_value = []
             
             # Test high confidence (auto_force)
             mock_base.return_value = 0.95
-            mock_ml.return_value = 0.95
-            decisions = self.force_mode._predict_force_decisions(error_analyses)
+            mock_ml.return_value = np.full(1, 0.95)
+            decisions, _ = self.force_mode._predict_force_decisions(error_analyses)
             self.assertEqual(decisions[0].action, "auto_force")
             
             # Test medium confidence (batch_confirm)
             mock_base.return_value = 0.80
-            mock_ml.return_value = 0.70
-            decisions = self.force_mode._predict_force_decisions(error_analyses)
+            mock_ml.return_value = np.full(1, 0.70)
+            decisions, _ = self.force_mode._predict_force_decisions(error_analyses)
             self.assertEqual(decisions[0].action, "batch_confirm")
             
             # Test low confidence (manual_review)
             mock_base.return_value = 0.60
-            mock_ml.return_value = 0.40
-            decisions = self.force_mode._predict_force_decisions(error_analyses)
+            mock_ml.return_value = np.full(1, 0.40)
+            decisions, _ = self.force_mode._predict_force_decisions(error_analyses)
             self.assertEqual(decisions[0].action, "manual_review")
             
             # Test very low confidence (skip)
             mock_base.return_value = 0.30
-            mock_ml.return_value = 0.20
-            decisions = self.force_mode._predict_force_decisions(error_analyses)
+            mock_ml.return_value = np.full(1, 0.20)
+            decisions, _ = self.force_mode._predict_force_decisions(error_analyses)
             self.assertEqual(decisions[0].action, "skip")
 
     def test_extract_error_features(self):
@@ -322,6 +364,26 @@ class TestIntelligentForceMode(unittest.TestCase):
         
         self.assertEqual(features[11], 1)  # Is test file (contains "test")
 
+    def test_feature_matrix_matches_per_error_features(self):
+        """The batched feature matrix and ML confidences match the per-error versions."""
+        error_analyses = [
+            self._create_mock_error_analysis(rule_id="no-unde", file_path="src/config.js"),
+            self._create_mock_error_analysis(
+                rule_id="max-len", severity=ErrorSeverity.ERROR, file_path="a/b/test_x.py"
+            ),
+            self._create_mock_error_analysis(rule_id="semi", line=3, message="m"),
+        ]
+
+        matrix = self.force_mode._extract_feature_matrix(error_analyses)
+        confidences = self.force_mode._predict_ml_confidences(matrix)
+
+        self.assertEqual(matrix.shape, (3, 16))
+        for row, confidence, error_analysis in zip(matrix, confidences, error_analyses):
+            features = self.force_mode._extract_error_features(error_analysis)
+            np.testing.assert_array_equal(row, features)
+            self.assertEqual(confidence, self.force_mode._predict_ml_confidence(features))
+        self.assertEqual(confidences.tolist(), [0.2, 0.9, 0.6])
+
     def test_get_base_confidence_unfixable(self):
         """Test _get_base_confidence with unfixable error."""
         error_analysis = self._create_mock_error_analysis(fixable=False)
@@ -355,6 +417,27 @@ class TestIntelligentForceMode(unittest.TestCase):
         
         self.assertEqual(confidence, 0.60)
 
+    def test_get_base_confidence_real_error_analysis(self):
+        """max-len in a JavaScript file reads the path from the lint error."""
+        error = LintError(
+            file_path="missing.js",
+            line=1,
+            column=1,
+            rule_id="max-len",
+            message="Line too long",
+            severity=ErrorSeverity.WARNING,
+            linter="eslint",
+        )
+        error_analysis = ErrorAnalysis(
+            error=error,
+            category=ErrorCategory.FORMATTING,
+            complexity=FixComplexity.TRIVIAL,
+            priority=5,
+            fixable=True,
+        )
+
+        self.assertEqual(self.force_mode._get_base_confidence(error_analysis), 0.85)
+
     @patch.object(IntelligentForceMode, '_predict_ml_confidence')
     def test_predict_ml_confidence_fallback(self, mock_ml_predict):
         """Test _predict_ml_confidence fallback."""
@@ -400,6 +483,66 @@ class TestIntelligentForceMode(unittest.TestCase):
             # Should have called AST analyzer once with list of files
             self.assertEqual(mock_analyze.call_count, 1)
 
+    def test_build_dependency_graph_reuses_analyzer_graph(self):
+        """The AST graph is annotated in place and the fallback starts from a fresh graph."""
+        error_analyses = [self._create_mock_error_analysis(file_path="file1.py")]
+        import networkx as nx
+        ast_graph = nx.DiGraph()
+
+        with patch.object(self.force_mode.ast_analyzer, 'analyze_files', return_value=ast_graph):
+            self.force_mode._build_dependency_graph(error_analyses)
+        self.assertIs(self.force_mode.dependency_graph, ast_graph)
+        self.assertEqual(ast_graph.nodes["file1.py"]["error_count"], 1)
+
+        with patch.object(
+            self.force_mode.ast_analyzer, 'analyze_files', side_effect=Exception("failed")
+        ):
+            self.force_mode._build_dependency_graph(error_analyses)
+        self.assertIsNot(self.force_mode.dependency_graph, ast_graph)
+        self.assertEqual(ast_graph.number_of_nodes(), 1)
+
+    def test_build_dependency_graph_keeps_graph_across_analyses(self):
+        """A later analysis does not clear or rebuild the graph from an earlier one."""
+        from aider_lint_fixer.ast_dependency_analyzer import EnhancedDependencyAnalyzer
+        self.force_mode.ast_analyzer = EnhancedDependencyAnalyzer()
+        first_errors = [self._create_mock_error_analysis(file_path="file1.py")]
+        second_errors = [self._create_mock_error_analysis(file_path="file2.py")]
+
+        self.force_mode._build_dependency_graph(first_errors)
+        first_graph = self.force_mode.dependency_graph
+        self.force_mode._build_dependency_graph(second_errors)
+
+        self.assertIsNot(self.force_mode.dependency_graph, first_graph)
+        self.assertEqual(list(first_graph), ["file1.py"])
+        self.assertEqual(first_graph.nodes["file1.py"]["error_count"], 1)
+        self.assertEqual(list(self.force_mode.dependency_graph), ["file2.py"])
+
+    def test_build_dependency_graph_uses_file_index(self):
+        """Nodes are annotated from the per-file rule index without regrouping errors."""
+        error_analyses = [
+            self._create_mock_error_analysis(file_path="file1.py", rule_id="semi"),
+            self._create_mock_error_analysis(file_path="file2.py", rule_id="quotes"),
+            self._create_mock_error_analysis(file_path="file1.py", rule_id="no-unde"),
+        ]
+        rule_ids_by_file = self.force_mode._index_files(error_analyses)
+        self.assertEqual(
+            rule_ids_by_file, {"file1.py": ["semi", "no-unde"], "file2.py": ["quotes"]}
+        )
+
+        with patch.object(self.force_mode.ast_analyzer, 'analyze_files') as mock_analyze:
+            import networkx as nx
+            mock_graph = nx.DiGraph()
+            mock_graph.add_node("file1.py")
+            mock_analyze.return_value = mock_graph
+
+            self.force_mode._build_dependency_graph(error_analyses, rule_ids_by_file)
+
+        mock_analyze.assert_called_once_with(["file1.py", "file2.py"])
+        nodes = self.force_mode.dependency_graph.nodes
+        self.assertEqual(nodes["file1.py"]["error_count"], 2)
+        self.assertEqual(nodes["file1.py"]["error_types"], ["semi", "no-unde"])
+        self.assertEqual(nodes["file2.py"]["error_types"], ["quotes"])
+
     def test_build_dependency_graph_fallback(self):
         """Test _build_dependency_graph fallback to heuristics."""
         error_analyses = [
@@ -418,6 +561,37 @@ class TestIntelligentForceMode(unittest.TestCase):
             self.assertTrue(self.force_mode.dependency_graph.has_node("/same/dir/file2.py"))
             self.assertTrue(self.force_mode.dependency_graph.has_node("/other/dir/file3.py"))
 
+    def test_build_dependency_graph_fallback_links_same_directory(self):
+        """The heuristic fallback links only files sharing a directory."""
+        error_analyses = [
+            self._create_mock_error_analysis(file_path="/same/dir/file1.py"),
+            self._create_mock_error_analysis(file_path="/other/dir/file3.py"),
+            self._create_mock_error_analysis(file_path="/same/dir/file2.py"),
+            self._create_mock_error_analysis(file_path="top.py"),
+        ]
+
+        with patch.object(self.force_mode.ast_analyzer, 'analyze_files') as mock_analyze:
+            mock_analyze.side_effect = Exception("AST analysis failed")
+            self.force_mode._build_dependency_graph(error_analyses)
+
+        self.assertEqual(
+            sorted(self.force_mode.dependency_graph.edges()),
+            [
+                ("/same/dir/file1.py", "/same/dir/file2.py"),
+                ("/same/dir/file2.py", "/same/dir/file1.py"),
+            ],
+        )
+
+    def test_path_features(self):
+        """Path-derived features and risk factors come from one lookup per file."""
+        self.assertEqual(_path_features("src/Config/test_app.js"), (True, True, False, True, 3))
+        self.assertEqual(_path_features("main.py"), (False, False, True, False, 1))
+
+        error_analysis = self._create_mock_error_analysis(file_path="app/config.py")
+        risk_factors = self.force_mode._identify_risk_factors(error_analysis, 0.9)
+        self.assertIn("Configuration file - changes affect entire system", risk_factors)
+        self.assertIn("Production code - changes affect users", risk_factors)
+
     def test_predict_cascades_with_dependencies(self):
         """Test _predict_cascades with file dependencies."""
         # Create force decisions
@@ -538,7 +712,27 @@ class TestIntelligentForceMode(unittest.TestCase):
             batch_plans = self.force_mode._optimize_batching(decisions, False)
             
             self.assertEqual(len(batch_plans), 1)
-            mock_create.assert_called_once_with(decisions, False)
+            mock_create.assert_called_once_with(decisions, False, None)
+
+    def test_predict_force_decisions_batching_features(self):
+        """Batching features come back with the decisions and feed batching as-is."""
+        error_analyses = [
+            self._create_mock_error_analysis(rule_id="semi", priority=2, effort=1),
+            self._create_mock_error_analysis(rule_id="other", priority=3, effort=4),
+        ]
+
+        decisions, features = self.force_mode._predict_force_decisions(error_analyses)
+
+        self.assertEqual(features.shape, (2, 4))
+        np.testing.assert_allclose(features[:, 0], [d.confidence for d in decisions], rtol=1e-6)
+        self.assertEqual(features[:, 1].tolist(), [len(d.risk_factors) for d in decisions])
+        self.assertEqual(features[:, 2:].tolist(), [[2, 1], [3, 4]])
+
+        # Risk factors added later by cascade prediction are picked up when batching
+        decisions[1].risk_factors.append("High cascade risk")
+        batches = self.force_mode._create_optimal_batches(decisions, False, features)
+        self.assertEqual(features[:, 1].tolist(), [len(d.risk_factors) for d in decisions])
+        self.assertEqual(sum(len(batch.errors) for batch in batches), 2)
 
     def test_create_optimal_batches_empty(self):
         """Test _create_optimal_batches with no decisions."""
@@ -562,6 +756,22 @@ class TestIntelligentForceMode(unittest.TestCase):
         self.assertEqual(batches[0].confidence, 0.80)
         self.assertEqual(len(batches[0].errors), 1)
 
+    def test_create_optimal_batches_small_uses_confidence_quantiles(self):
+        """Small decision sets are batched by confidence quantile."""
+        confidences = [0.5 + 0.01 * i for i in range(30)]
+        decisions = [
+            ForceDecision(self._create_mock_error_analysis(), "batch_confirm", confidence)
+            for confidence in confidences
+        ]
+
+        batches = self.force_mode._create_optimal_batches(decisions, False)
+
+        # 30 decisions make 4 batches of increasing confidence covering every decision
+        self.assertEqual([batch.batch_id for batch in batches], [1, 2, 3, 4])
+        self.assertEqual(sum(len(batch.errors) for batch in batches), 30)
+        averages = [batch.confidence for batch in batches]
+        self.assertEqual(averages, sorted(averages))
+
     def test_create_execution_strategy(self):
         """Test _create_execution_strategy method."""
         force_decisions = [
@@ -588,6 +798,28 @@ class TestIntelligentForceMode(unittest.TestCase):
             self.assertTrue(strategy["auto_force_enabled"])
             self.assertEqual(strategy["recommendations"], ["Test recommendation"])
 
+    def test_collect_stats_single_pass(self):
+        """_collect_stats gathers every reporting count from the decisions."""
+        force_decisions = [
+            ForceDecision(self._create_mock_error_analysis(), "auto_force", 0.95),
+            ForceDecision(
+                self._create_mock_error_analysis(rule_id="no-unde"),
+                "manual_review",
+                0.60,
+                predicted_cascades=["a.py", "b.py", "c.py"],
+            ),
+            ForceDecision(
+                self._create_mock_error_analysis(), "auto_force", 0.95, predicted_cascades=["a.py"]
+            ),
+        ]
+
+        stats = self.force_mode._collect_stats(force_decisions)
+
+        self.assertEqual(dict(stats.action_counts), {"auto_force": 2, "manual_review": 1})
+        self.assertEqual(stats.auto_force_count, 2)
+        self.assertEqual(stats.dangerous_count, 1)
+        self.assertEqual(stats.high_cascade_count, 1)
+
     def test_generate_recommendations_normal_codebase(self):
         """Test _generate_recommendations for normal codebase."""
         force_decisions = [
@@ -654,6 +886,32 @@ class TestIntelligentForceMode(unittest.TestCase):
             self.force_mode.learn_from_outcome(decision, success=True)
             mock_update.assert_called_once()
 
+    @patch('aider_lint_fixer.intelligent_force_mode.logger')
+    def test_update_confidence_thresholds_uses_last_100_outcomes(self, mock_logger):
+        """Test that older outcomes drop out of the threshold window."""
+        decision = ForceDecision(self._create_mock_error_analysis(), "auto_force", 0.85)
+
+        for i in range(100):
+            self.force_mode.learn_from_outcome(decision, success=False)
+        for i in range(100):
+            self.force_mode.learn_from_outcome(decision, success=True)
+
+        # Only the 100 successes remain in the window, so the threshold relaxes
+        self.force_mode.auto_force_threshold = 0.9
+        self.force_mode._update_confidence_thresholds()
+        self.assertAlmostEqual(self.force_mode.auto_force_threshold, 0.88)
+
+        # Outcomes appended directly to fix_history are picked up as well
+        failure = {
+            "decision": decision,
+            "success": False,
+            "created_new_errors": True,
+            "confidence_was_correct": False,
+        }
+        self.force_mode.fix_history.extend([failure] * 20)
+        self.force_mode._update_confidence_thresholds()
+        self.assertAlmostEqual(self.force_mode.auto_force_threshold, 0.9)
+
     @patch('aider_lint_fixer.intelligent_force_mode.logger')
     def test_update_confidence_thresholds_high_success(self, mock_logger):
         """Test _update_confidence_thresholds with high success rate."""
@@ -752,6 +1010,27 @@ class TestIntelligentForceModeIntegration(unittest.TestCase):
 
         return mock_analysis
 
+    def test_create_optimal_batches_large_uses_clustering(self):
+        """Larger decision sets are clustered, assigning every decision once."""
+        decisions = [
+            ForceDecision(
+                self._create_mock_error_analysis(priority=i % 4, effort=1 + i % 3),
+                "batch_confirm",
+                0.75 + 0.002 * i,
+            )
+            for i in range(80)
+        ]
+
+        with patch.object(
+            self.force_mode.scaler, "fit_transform", wraps=self.force_mode.scaler.fit_transform
+        ) as mock_scale:
+            batches = self.force_mode._create_optimal_batches(decisions, True)
+
+        self.assertLessEqual(len(batches), 80 // self.force_mode.optimal_batch_size + 1)
+        self.assertEqual(sum(len(batch.errors) for batch in batches), 80)
+        # Clustering runs on a float32 feature matrix
+        self.assertEqual(mock_scale.call_args[0][0].dtype, np.float32)
+
     def test_get_base_confidence_complex_js_string(self):
         """Test _get_base_confidence with a complex JavaScript string."""
         # Create a mock error analysis for a JS file with a complex string
@@ -795,6 +1074,29 @@ class TestIntelligentForceModeIntegration(unittest.TestCase):
         os.remove(tmpfile_path)
         os.remove(tmpfile_path_simple)
 
+    def test_complex_javascript_string_reads_file_once(self):
+        """Errors in the same file share one read within a single prediction."""
+        path = Path(self.temp_dir) / "long.js"
+        path.write_text('const a = "x" + `y`;\nconst b = 1;\n', encoding="utf-8")
+        error_analyses = [
+            self._create_mock_error_analysis(rule_id="max-len", file_path=str(path), line=line)
+            for line in (1, 2, 1)
+        ]
+
+        with patch("builtins.open", wraps=open) as mock_open:
+            decisions, _ = self.force_mode._predict_force_decisions(error_analyses)
+
+        self.assertEqual([d.confidence < 0.8 for d in decisions], [True, False, True])
+        self.assertEqual(mock_open.call_count, 1)
+
+        # The next prediction, or a direct check, reads the file as it is now
+        path.write_text("const a = 1;\n", encoding="utf-8")
+        self.assertFalse(self.force_mode._is_complex_javascript_string(error_analyses[0]))
+        with patch("builtins.open", wraps=open) as mock_open:
+            decisions, _ = self.force_mode._predict_force_decisions(error_analyses[:1])
+        self.assertEqual(mock_open.call_count, 1)
+        self.assertGreater(decisions[0].confidence, 0.8)
+
     def test_identify_risk_factors(self):
         """Test the _identify_risk_factors method."""
         # Test undefined variable risk
@@ -850,6 +1152,151 @@ class TestIntelligentForceModeIntegration(unittest.TestCase):
         self.assertIsNotNone(decision.predicted_cascades)
         self.assertIn("file2.py", decision.predicted_cascades)
 
+    def test_freeze_graph_builds_csr_adjacency(self):
+        """The CSR snapshot mirrors successors, predecessors and edge lookups."""
+        graph = self.force_mode.dependency_graph
+        graph.add_edge("file1.py", "file2.py", type="import", imported_names=["f"])
+        graph.add_edge("file3.py", "file1.py", type="calls")
+        graph.add_edge("file2.py", "file3.py")
+
+        csr = self.force_mode._freeze_graph()
+
+        self.assertEqual(csr.nodes, ["file1.py", "file2.py", "file3.py"])
+        self.assertEqual(csr.graph_size, (3, 3))
+        self.assertEqual(csr.out_indptr.tolist(), [0, 1, 2, 3])
+        self.assertEqual(csr.out_indices.tolist(), [1, 2, 0])
+        self.assertEqual(csr.in_indices.tolist(), [2, 0, 1])
+        self.assertEqual(csr.in_edges.tolist(), [2, 0, 1])
+        # The attribute-less file2 -> file3 edge can never cascade
+        self.assertEqual(csr.edge_multiplier.tolist(), [0.8, 0.0, 0.6])
+        self.assertEqual(csr.edge_boosted.tolist(), [True, False, False])
+        self.assertEqual(csr.edge_is_import.tolist(), [True, False, False])
+
+    def test_frozen_dependency_graph_follows_replaced_graph(self):
+        """Replacing the graph with one of the same size does not reuse the old snapshot."""
+        import networkx as nx
+        self.force_mode.dependency_graph.add_edge("a.py", "b.py", type="import")
+        self.assertEqual(self.force_mode._frozen_dependency_graph().nodes, ["a.py", "b.py"])
+
+        replacement = nx.DiGraph()
+        replacement.add_edge("x.py", "y.py", type="import")
+        self.force_mode.dependency_graph = replacement
+        self.assertIsNone(self.force_mode._dependency_csr)
+        self.assertEqual(self.force_mode._frozen_dependency_graph().nodes, ["x.py", "y.py"])
+
+        # A snapshot of another graph is not mistaken for the current one
+        other = nx.DiGraph()
+        other.add_edge("a.py", "b.py", type="import")
+        self.force_mode._dependency_csr.graph = other
+        self.assertIs(self.force_mode._frozen_dependency_graph().graph, replacement)
+
+    def test_predict_cascades_scores_each_direction_by_its_own_edge(self):
+        """A dependency in both directions is scored separately for each edge."""
+        self.force_mode.dependency_graph.add_edge("file1.py", "file2.py", type="import")
+        self.force_mode.dependency_graph.add_edge("file2.py", "file1.py", type="calls")
+        decision = ForceDecision(
+            error_analysis=self._create_mock_error_analysis(
+                file_path="file1.py", rule_id="import/no-unresolved"
+            ),
+            action="auto_force",
+            confidence=0.9,
+            risk_factors=[],
+        )
+
+        self.force_mode._predict_cascades([decision])
+
+        # Only the import edge is risky enough; the calls edge back is not
+        self.assertEqual(decision.predicted_cascades, ["file2.py"])
+
+    def test_predict_cascades_scores_each_edge_once(self):
+        """Decisions on the same file reuse the edge's cascade weight."""
+        self.force_mode.dependency_graph.add_edge("file1.py", "file2.py", type="import")
+        self.force_mode.dependency_graph.add_edge("file3.py", "file1.py", type="calls")
+        decisions = [
+            ForceDecision(
+                error_analysis=self._create_mock_error_analysis(
+                    file_path="file1.py", rule_id="import/no-unresolved"
+                ),
+                action="auto_force",
+                confidence=0.9,
+                risk_factors=[],
+            )
+            for _ in range(3)
+        ]
+
+        with patch.object(
+            self.force_mode,
+            "_edge_cascade_weight",
+            wraps=self.force_mode._edge_cascade_weight,
+        ) as mock_weight:
+            self.force_mode._predict_cascades(decisions)
+
+        self.assertEqual(mock_weight.call_count, 2)
+        for decision in decisions:
+            self.assertEqual(decision.predicted_cascades, ["file2.py"])
+
+    def test_predict_cascades_reuses_prediction_per_file_and_rule(self):
+        """Errors sharing a file and rule are scored against the graph once."""
+        self.force_mode.dependency_graph.add_edge("file1.py", "file2.py", type="import")
+        decisions = [
+            ForceDecision(
+                error_analysis=self._create_mock_error_analysis(file_path="file1.py", rule_id=rule),
+                action="auto_force",
+                confidence=0.9,
+                risk_factors=[],
+            )
+            for rule in ("import/no-unresolved", "import/no-unresolved", "prefer-const")
+        ]
+
+        with patch.object(
+            self.force_mode,
+            "_predict_one_cascade",
+            wraps=self.force_mode._predict_one_cascade,
+        ) as mock_predict:
+            self.force_mode._predict_cascades(decisions)
+
+        self.assertEqual(mock_predict.call_count, 2)
+        self.assertEqual(decisions[0].predicted_cascades, ["file2.py"])
+        self.assertEqual(decisions[1].predicted_cascades, ["file2.py"])
+        self.assertIsNot(decisions[0].predicted_cascades, decisions[1].predicted_cascades)
+        self.assertEqual(decisions[2].predicted_cascades, [])
+
+    def test_predict_cascades_queries_ast_dependencies_once_per_file(self):
+        """Undefined-variable errors in one file share a single AST dependency lookup."""
+        decisions = [
+            ForceDecision(
+                error_analysis=self._create_mock_error_analysis(
+                    file_path="file1.py", rule_id="no-unde"
+                ),
+                action="batch_confirm",
+                confidence=0.8,
+                risk_factors=[],
+                predicted_cascades=[],
+            )
+            for _ in range(4)
+        ]
+
+        with patch.object(
+            self.force_mode.ast_analyzer, "get_function_dependencies", return_value=["a.py"]
+        ) as mock_functions, patch.object(
+            self.force_mode.ast_analyzer, "get_variable_dependencies", return_value=["b.py"]
+        ) as mock_variables:
+            self.force_mode._predict_cascades(decisions)
+
+        mock_functions.assert_called_once_with("file1.py")
+        mock_variables.assert_called_once_with("file1.py")
+        for decision in decisions:
+            self.assertEqual(sorted(decision.predicted_cascades), ["a.py", "b.py"])
+
+    def test_top_k_order_matches_stable_sort(self):
+        """Top-k selection keeps the stable descending order, ties included."""
+        scores = np.array([0.25, 0.21, 0.26, 0.25, 0.21, 0.25, 0.26])
+
+        self.assertEqual(_top_k_order(scores, 3).tolist(), [2, 6, 0])
+        self.assertEqual(_top_k_order(scores, 4).tolist(), [2, 6, 0, 3])
+        self.assertEqual(_top_k_order(scores[:2], 3).tolist(), [0, 1])
+        self.assertEqual(_top_k_order(np.array([]), 3).tolist(), [])
+
     def test_calculate_cascade_risk_with_imported_names(self):
         """Test _calculate_cascade_risk with imported names."""
         edge_data = {"type": "import", "imported_names": ["my_func"]}
@@ -6,6 +6,7 @@ Tests the IterativeForceMode class for intelligent iterative
 force mode with loop detection and convergence analysis.
 """
 
+import dataclasses
 import tempfile
 import unittest
 from pathlib import Path
@@ -100,6 +101,14 @@ class TestIterationResult(unittest.TestCase):
         self.assertEqual(result.cost, 0.0)  # Default value
         self.assertEqual(result.tokens_used, 0)  # Default value
 
+    def test_iteration_result_is_immutable(self):
+        """Test IterationResult is a frozen, slotted record."""
+        result = IterationResult(1, 50, 40, 10, 12, 0.83, 60.0, 0, 20.0, 0.75, 35)
+
+        with self.assertRaises(dataclasses.FrozenInstanceError):
+            result.errors_after = 30
+        self.assertFalse(hasattr(result, "__dict__"))
+
 
 class TestLoopRecommendation(unittest.TestCase):
     """Test LoopRecommendation dataclass."""
@@ -654,6 +663,83 @@ class TestIterativeForceMode(unittest.TestCase):
         self.assertEqual(summary["total_time"], 150.0)
         self.assertAlmostEqual(summary["average_improvement_per_iteration"], 16.3, places=1)
 
+    def test_get_performance_summary_beyond_max_iterations(self):
+        """Test analyze_iteration_patterns after more results than max_iterations."""
+        for i in range(1, 13):
+            self.iterative_mode.record_iteration_result(
+                iteration=i, errors_before=200 - 10 * i, errors_after=190 - 10 * i,
+                errors_fixed=10, errors_attempted=12, success_rate=0.8, time_taken=30.0,
+                new_errors_introduced=0, improvement_percentage=float(i),
+                ml_accuracy=0.8, fixable_errors=50
+            )
+
+        summary = self.iterative_mode.analyze_iteration_patterns()
+
+        self.assertEqual(summary["total_iterations"], 12)
+        self.assertAlmostEqual(summary["average_improvement_per_iteration"], 6.5)
+        self.assertEqual(summary["improvement_trend"], "increasing")
+
+        # Replacing the results list is reflected in the next analysis
+        self.iterative_mode.iteration_results = [
+            IterationResult(1, 100, 90, 10, 12, 0.8, 30.0, 0, 10.0, 0.8, 50),
+            IterationResult(2, 90, 85, 5, 12, 0.4, 30.0, 0, 5.0, 0.7, 45),
+        ]
+        summary = self.iterative_mode.analyze_iteration_patterns()
+
+        self.assertEqual(summary["total_iterations"], 2)
+        self.assertAlmostEqual(summary["average_improvement_per_iteration"], 7.5)
+        self.assertEqual(summary["improvement_trend"], "decreasing")
+
+    def test_get_performance_summary_reused_until_next_iteration(self):
+        """Test analyze_iteration_patterns reuses its analysis until a result is added."""
+        for i in range(1, 3):
+            self.iterative_mode.record_iteration_result(
+                iteration=i, errors_before=100 - 10 * i, errors_after=90 - 10 * i,
+                errors_fixed=10, errors_attempted=12, success_rate=0.8, time_taken=30.0,
+                new_errors_introduced=0, improvement_percentage=10.0,
+                ml_accuracy=0.8, fixable_errors=50
+            )
+
+        first = self.iterative_mode.analyze_iteration_patterns()
+        second = self.iterative_mode.analyze_iteration_patterns()
+        self.assertEqual(second, first)
+        self.assertEqual(list(self.iterative_mode._analysis_cache), [2])
+
+        # Callers get copies, so changing one leaves later answers intact
+        first["total_iterations"] = 99
+        self.assertEqual(self.iterative_mode.analyze_iteration_patterns()["total_iterations"], 2)
+
+        self.iterative_mode.record_iteration_result(
+            iteration=3, errors_before=70, errors_after=60, errors_fixed=10,
+            errors_attempted=12, success_rate=0.8, time_taken=30.0,
+            new_errors_introduced=0, improvement_percentage=13.0,
+            ml_accuracy=0.8, fixable_errors=50
+        )
+        updated = self.iterative_mode.analyze_iteration_patterns()
+
+        self.assertIsNot(updated, first)
+        self.assertEqual(updated["total_iterations"], 3)
+        self.assertEqual(updated["total_time"], 90.0)
+
+    def test_should_recommend_refactor_slow_progress(self):
+        """Test should_recommend_refactor after many low-progress iterations."""
+        self.iterative_mode.iteration_results = [
+            IterationResult(i, 100 - i, 99 - i, 1, 10, 0.1, 30.0, 0, 1.0, 0.5, 50)
+            for i in range(1, 5)
+        ]
+        self.assertFalse(self.iterative_mode.should_recommend_refactor())
+
+        self.iterative_mode.iteration_results.append(
+            IterationResult(5, 95, 94, 1, 10, 0.1, 30.0, 0, 1.0, 0.5, 50)
+        )
+        self.assertTrue(self.iterative_mode.should_recommend_refactor())
+
+        # The verdict follows the thresholds as they are when asked
+        self.iterative_mode.refactor_iteration_threshold = 10
+        self.assertFalse(self.iterative_mode.should_recommend_refactor())
+        self.iterative_mode.refactor_error_density_threshold = 5
+        self.assertTrue(self.iterative_mode.should_recommend_refactor())
+
     def test_get_performance_summary_empty(self):
         """Test analyze_iteration_patterns with no results."""
         summary = self.iterative_mode.analyze_iteration_patterns()
@@ -761,6 +847,24 @@ class TestIterativeForceMode(unittest.TestCase):
         self.assertEqual(recommendation.action, "manual_review")
         self.assertIn("threshold not met", recommendation.reason.lower())
 
+    def test_generate_recommendations_static_reasons(self):
+        """Test fixed exit reasons reuse their prebuilt recommendation."""
+        with patch.object(self.iterative_mode, "analyze_iteration_patterns") as mock_analyze:
+            recommendation = self.iterative_mode.generate_recommendations(
+                LoopExitReason.ERROR_INCREASE, "Errors increased by 10"
+            )
+            again = self.iterative_mode.generate_recommendations(
+                LoopExitReason.ERROR_INCREASE, "Errors increased by 12"
+            )
+
+        mock_analyze.assert_not_called()
+        self.assertIs(recommendation, again)
+        # The shared recommendation cannot be modified by one caller for the next
+        self.assertIsInstance(recommendation.specific_suggestions, tuple)
+        self.assertIsInstance(recommendation.dangerous_patterns, tuple)
+        self.assertEqual(recommendation.action, "manual_review")
+        self.assertEqual(recommendation.reason, "Automated fixes are introducing new errors")
+
     def test_display_performance_summary_with_data(self):
         """Test display_loop_summary with data."""
         # Add iteration results
@@ -792,6 +896,33 @@ class TestIterativeForceMode(unittest.TestCase):
             summary_found = any("ITERATIVE FORCE MODE SUMMARY" in str(call) for call in print_calls)
             self.assertTrue(summary_found)
 
+    def test_display_loop_summary_prints_once(self):
+        """Test display_loop_summary writes the whole summary in a single print."""
+        self.iterative_mode.record_iteration_result(
+            iteration=1, errors_before=100, errors_after=80, errors_fixed=20,
+            errors_attempted=25, success_rate=0.8, time_taken=60.0,
+            new_errors_introduced=0, improvement_percentage=20.0,
+            ml_accuracy=0.85, fixable_errors=75
+        )
+        self.iterative_mode.record_iteration_result(
+            iteration=2, errors_before=80, errors_after=60, errors_fixed=20,
+            errors_attempted=22, success_rate=0.91, time_taken=70.0,
+            new_errors_introduced=0, improvement_percentage=25.0,
+            ml_accuracy=0.87, fixable_errors=55
+        )
+
+        with patch('builtins.print') as mock_print:
+            self.iterative_mode.display_loop_summary(
+                LoopExitReason.CONVERGENCE_DETECTED, "Error count converged"
+            )
+
+        mock_print.assert_called_once()
+        summary = mock_print.call_args.args[0]
+        self.assertIn("   Iteration 2: 80 → 60 (+25.0%, 0.9% success)", summary.splitlines())
+        self.assertIn(
+            "\n🛑 Loop Exit Reason:\n   convergence_detected: Error count converged", summary
+        )
+
     def test_display_performance_summary_empty(self):
         """Test display_loop_summary with no data."""
         with patch('builtins.print') as mock_print: